@@ -1,4 +1,7 @@
 """
+title: CAMEL Multi-Agent Discussion
+requirements: aiohttp, httpx
+
 CAMEL Multi-Agent Discussion Function for Open WebUI
 =====================================================
 
@@ -22,12 +25,72 @@ Usage:
 - Consensus detection happens automatically
 """
 
+from collections import OrderedDict, defaultdict
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List, Any, Callable, Awaitable
+from typing import Optional, Dict, List, Tuple, Any, Callable, Awaitable
+import aiohttp
 import httpx
 import json
 import asyncio
-from datetime import datetime
+import importlib.util
+import re
+import time
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder/decoder
+    orjson = None
+
+
+# Command classifier for Action.action. Each branch is a lookahead, so the
+# first command in priority order that appears anywhere in the message wins
+# (same precedence as checking the keywords one by one), in a single match.
+_CMD_RE = re.compile(
+    r"^(?:"
+    r"(?=.*?(?P<start>start discussion|create discussion))"
+    r"|(?=.*?(?P<send>send message))"
+    r"|(?=.*?(?P<status>status|show discussion))"
+    r"|(?=.*?(?P<stop>stop))"
+    r"|(?=.*?(?P<models>list models|show models))"
+    r")",
+    re.IGNORECASE | re.DOTALL
+)
+# Splits the topic off a "start discussion about ..." command
+_ABOUT_RE = re.compile(r"about", re.IGNORECASE)
+
+
+# HTTP/2 needs the optional "h2" package (httpx[http2]) and Brotli decoding
+# needs "brotli"; only ask for them when they are installed.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_ACCEPT_ENCODING = (
+    "br, gzip"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip"
+)
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_STATUS_ICONS = {
+    "running": "🔄",
+    "completed": "✅",
+    "stopped": "⏸️",
+    "failed": "❌"
+}
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a request body to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Decode a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 class Valves(BaseModel):
@@ -74,7 +137,351 @@ class Tools:
 
     def __init__(self):
         self.valves = self.Valves()
-        self.active_discussions: Dict[str, Dict[str, Any]] = {}
+        # LRU order, most recently used discussion last; the least recently
+        # used inactive ones are evicted past _max_active
+        self.active_discussions: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._max_active = 256
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_base_url: Optional[str] = None
+        # (API endpoint, time.monotonic() stamp, formatted output)
+        self._models_cache: Optional[Tuple[str, float, str]] = None
+        self._models_ttl = 60.0
+        self._models_lock = asyncio.Lock()
+        # Close tasks for replaced clients, held so they aren't collected mid-run
+        self._closing: set = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use
+
+        Reusing one client keeps connections to the API alive between calls.
+        The client is rebuilt if the API_ENDPOINT valve changes.
+        """
+        base_url = self.valves.API_ENDPOINT.rstrip("/")
+        if (
+            self._client is None
+            or self._client.is_closed
+            or str(self._client.base_url).rstrip("/") != base_url
+        ):
+            stale = self._client
+            self._client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=httpx.Timeout(10.0),
+                # A custom transport owns the pool, so limits/http2 are set on it
+                transport=httpx.AsyncHTTPTransport(
+                    retries=3,
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                ),
+                headers={"Accept-Encoding": _ACCEPT_ENCODING}
+            )
+            if stale is not None and not stale.is_closed:
+                self._close_later(stale.aclose())
+        return self._client
+
+    def _get_sync_client(self) -> httpx.Client:
+        """
+        Get the shared blocking HTTP client, creating it on first use
+
+        Only used by the synchronous entry points; async code goes through
+        _get_client() so it never blocks the event loop.
+        """
+        base_url = self.valves.API_ENDPOINT.rstrip("/")
+        if (
+            self._sync_client is None
+            or self._sync_client.is_closed
+            or str(self._sync_client.base_url).rstrip("/") != base_url
+        ):
+            if self._sync_client is not None:
+                self._sync_client.close()
+            self._sync_client = httpx.Client(
+                base_url=base_url,
+                timeout=httpx.Timeout(10.0),
+                transport=httpx.HTTPTransport(
+                    retries=3,
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+                ),
+                headers={"Accept-Encoding": _ACCEPT_ENCODING}
+            )
+        return self._sync_client
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared aiohttp session used on the per-message hot path
+
+        Must be called from a running event loop. Like the httpx client, it
+        is rebuilt if the API_ENDPOINT valve changes.
+        """
+        base_url = self.valves.API_ENDPOINT.rstrip("/")
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_base_url != base_url
+        ):
+            stale = self._session
+            self._session = aiohttp.ClientSession(
+                base_url=base_url,
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            self._session_base_url = base_url
+            if stale is not None and not stale.closed:
+                self._close_later(stale.close())
+        return self._session
+
+    async def _subscribe(
+        self,
+        discussion_id: str,
+        __event_emitter__: Callable[[Any], Awaitable[None]]
+    ):
+        """
+        Relay live discussion events from the API WebSocket to the chat
+
+        Runs as a background task per discussion until the discussion
+        completes, is stopped, or the task is cancelled.
+        """
+        ws_url = f"{self.valves.WEBSOCKET_ENDPOINT.rstrip('/')}/ws/discussions/{discussion_id}"
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.ws_connect(ws_url, heartbeat=30) as ws:
+                    async for frame in ws:
+                        if frame.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                            break
+                        if await self._relay_event(_json_loads(frame.data), __event_emitter__):
+                            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await __event_emitter__({
+                "type": "status",
+                "data": {"description": f"⚠️ Live updates unavailable: {str(e)}", "done": True}
+            })
+
+    @staticmethod
+    def _format_agent_message(data: Dict[str, Any]) -> str:
+        """Markdown for one relayed agent message"""
+        return (
+            f"\n\n**{data.get('role_name', 'Agent')}** "
+            f"({data.get('model', '?')}) · Turn {data.get('turn_number', '?')}\n\n"
+            f"{data.get('content', '')}"
+        )
+
+    async def _relay_event(
+        self,
+        event: Dict[str, Any],
+        __event_emitter__: Callable[[Any], Awaitable[None]]
+    ) -> bool:
+        """
+        Forward one WebSocket event to Open WebUI
+
+        Returns:
+            True if the event ends the discussion
+        """
+        event_type = event.get("type")
+        data = event.get("data") or {}
+
+        if event_type == "agent_message":
+            await __event_emitter__({
+                "type": "message",
+                "data": {"content": self._format_agent_message(data)}
+            })
+        elif event_type == "agent_messages_batch":
+            await __event_emitter__({
+                "type": "message",
+                "data": {"content": "".join(self._format_agent_message(m) for m in event.get("data") or ())}
+            })
+        elif event_type == "discussion_complete":
+            consensus_text = "✅ Yes" if data.get("consensus_reached") else "❌ No"
+            await __event_emitter__({
+                "type": "message",
+                "data": {
+                    "content": f"\n\n### 🏁 Discussion Complete\n\n"
+                               f"**Turns**: {data.get('total_turns', 0)}\n"
+                               f"**Consensus**: {consensus_text}\n\n"
+                               f"{data.get('final_summary', '')}"
+                }
+            })
+            return True
+        elif event_type == "error":
+            await __event_emitter__({
+                "type": "status",
+                "data": {"description": f"❌ Discussion error: {event.get('error', 'unknown')}", "done": True}
+            })
+            return True
+        elif event_type in ("discussion_stopped", "discussion_deleted"):
+            return True
+
+        return False
+
+    def _cancel_subscription(self, discussion: Optional[Dict[str, Any]]):
+        """Cancel the live-update task of a discussion entry, if any"""
+        task = discussion.get("ws_task") if discussion else None
+        if task is not None and not task.done():
+            task.cancel()
+
+    def _close_later(self, close: Awaitable[None]):
+        """Run a client's close coroutine in the background, keeping a reference"""
+        task = asyncio.create_task(close)
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _aclose(self):
+        """Close the shared HTTP client and session"""
+        for discussion in self.active_discussions.values():
+            self._cancel_subscription(discussion)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    def _build_create_payload(
+        self,
+        topic: str,
+        user_id: str,
+        num_agents: int,
+        max_turns: int
+    ) -> bytes:
+        """Encode the body of a create-discussion request"""
+        return _json_dumps({
+            "topic": topic,
+            "num_agents": num_agents,
+            "user_id": user_id,
+            "max_turns": max_turns,
+            "model_preferences": ["gpt-4", "claude-3-opus", "gemini-pro"]
+        })
+
+    def _resolve_create_settings(
+        self,
+        topic: str,
+        num_agents: Optional[int],
+        max_turns: Optional[int]
+    ) -> Tuple[int, int, Optional[str]]:
+        """
+        Apply valve defaults and validate create-discussion settings locally
+
+        Returns:
+            (num_agents, max_turns, error message or None)
+        """
+        num_agents = num_agents or self.valves.DEFAULT_NUM_AGENTS
+        max_turns = max_turns or self.valves.DEFAULT_MAX_TURNS
+
+        if not (2 <= num_agents <= 6) or not (3 <= max_turns <= 30) or len(topic.strip()) < 10:
+            return num_agents, max_turns, (
+                "❌ Invalid discussion settings: topic must be at least 10 characters, "
+                "agents 2-6 and turns 3-30"
+            )
+        return num_agents, max_turns, None
+
+    def _remember_discussion(
+        self,
+        discussion_id: str,
+        topic: str,
+        roles: List[Dict[str, Any]],
+        user_id: str
+    ):
+        """Track a newly created discussion, evicting the oldest past the cap"""
+        self.active_discussions[discussion_id] = {
+            "topic": topic,
+            "roles": roles,
+            "created_at_ns": time.time_ns(),
+            "user_id": user_id
+        }
+        self.active_discussions.move_to_end(discussion_id)
+        self._evict_inactive()
+
+    def _evict_inactive(self):
+        """
+        Drop least recently used discussions past _max_active
+
+        Discussions still relaying live updates are skipped, as is the most
+        recent one (its subscription may not have started yet), so the map
+        can exceed the cap while that many subscriptions are running.
+        """
+        excess = len(self.active_discussions) - self._max_active
+        if excess <= 0:
+            return
+
+        for discussion_id, discussion in list(self.active_discussions.items())[:-1]:
+            task = discussion.get("ws_task")
+            if task is not None and not task.done():
+                continue
+            del self.active_discussions[discussion_id]
+            excess -= 1
+            if excess == 0:
+                break
+
+    def _most_recent_discussion(self) -> Optional[str]:
+        """Most recently used discussion ID (marked used again), or None"""
+        if not self.active_discussions:
+            return None
+        discussion_id = next(reversed(self.active_discussions))
+        self.active_discussions.move_to_end(discussion_id)
+        return discussion_id
+
+    def _touch(self, discussion_id: str):
+        """Mark a tracked discussion as most recently used"""
+        if discussion_id in self.active_discussions:
+            self.active_discussions.move_to_end(discussion_id)
+
+    @staticmethod
+    async def _emit(
+        emitter: Optional[Callable[[Any], Awaitable[None]]],
+        event: Dict[str, Any]
+    ):
+        """Send an event through Open WebUI's emitter, if one was given"""
+        if emitter is not None:
+            await emitter(event)
+
+    def _create_discussion_sync(
+        self,
+        topic: str,
+        user_id: str,
+        num_agents: Optional[int] = None,
+        max_turns: Optional[int] = None
+    ) -> str:
+        """
+        Create a discussion from synchronous code (scripts, worker threads)
+
+        Skips the event emitter and live updates; blocks the calling thread,
+        so never call it from inside the event loop.
+
+        Returns:
+            Discussion ID, or an error message
+        """
+        num_agents, max_turns, error_msg = self._resolve_create_settings(topic, num_agents, max_turns)
+        if error_msg:
+            return error_msg
+
+        try:
+            response = self._get_sync_client().post(
+                "/api/discussions/create",
+                timeout=30.0,
+                headers=_JSON_HEADERS,
+                content=self._build_create_payload(topic, user_id, num_agents, max_turns)
+            )
+            response.raise_for_status()
+
+            data = _json_loads(response.content)
+            self._remember_discussion(data["discussion_id"], topic, data["roles"], user_id)
+            return data["discussion_id"]
+
+        except httpx.HTTPStatusError as e:
+            return f"Failed to create discussion: {e.response.text}"
+        except httpx.TimeoutException:
+            return "⏱️ Request timeout - API may be slow or unavailable"
+        except Exception as e:
+            return f"❌ Error creating discussion: {str(e)}"
 
     async def create_discussion(
         self,
@@ -92,99 +499,105 @@ class Tools:
             user_id: User identifier
             num_agents: Number of AI agents (optional)
             max_turns: Maximum discussion turns (optional)
-            __event_emitter__: Event emitter for status updates
+            __event_emitter__: Event emitter for status updates and live
+                messages; without one the discussion is only created
 
         Returns:
             Discussion ID
         """
-        if __event_emitter__:
-            await __event_emitter__({
+        # Reject invalid input locally instead of paying for an API round-trip
+        num_agents, max_turns, error_msg = self._resolve_create_settings(topic, num_agents, max_turns)
+        if error_msg:
+            await self._emit(__event_emitter__, {
                 "type": "status",
-                "data": {
-                    "description": f"🎭 Creating discussion with {num_agents or self.valves.DEFAULT_NUM_AGENTS} AI agents...",
-                    "done": False
-                }
+                "data": {"description": error_msg, "done": True}
             })
+            return error_msg
+
+        await self._emit(__event_emitter__, {
+            "type": "status",
+            "data": {
+                "description": f"🎭 Creating discussion with {num_agents} AI agents...",
+                "done": False
+            }
+        })
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.valves.API_ENDPOINT}/api/discussions/create",
-                    json={
-                        "topic": topic,
-                        "num_agents": num_agents or self.valves.DEFAULT_NUM_AGENTS,
-                        "user_id": user_id,
-                        "max_turns": max_turns or self.valves.DEFAULT_MAX_TURNS,
-                        "model_preferences": ["gpt-4", "claude-3-opus", "gemini-pro"]
-                    }
-                )
+            client = self._get_client()
+            response = await client.post(
+                "/api/discussions/create",
+                timeout=30.0,
+                headers=_JSON_HEADERS,
+                content=self._build_create_payload(topic, user_id, num_agents, max_turns)
+            )
+            response.raise_for_status()
 
-                if response.status_code != 201:
-                    error_msg = f"Failed to create discussion: {response.text}"
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {
-                                "description": f"❌ {error_msg}",
-                                "done": True
-                            }
-                        })
-                    return error_msg
-
-                data = response.json()
-                discussion_id = data["discussion_id"]
-
-                # Store discussion info
-                self.active_discussions[discussion_id] = {
-                    "topic": topic,
-                    "roles": data["roles"],
-                    "created_at": datetime.utcnow().isoformat(),
-                    "user_id": user_id
-                }
+            data = _json_loads(response.content)
+            discussion_id = data["discussion_id"]
 
-                # Emit roles info
-                if __event_emitter__:
-                    roles_text = "\n".join([
-                        f"  • **{role['name']}** ({role['model']}): {role['expertise']}"
-                        for role in data["roles"]
-                    ])
+            # Store discussion info
+            self._remember_discussion(discussion_id, topic, data["roles"], user_id)
 
-                    await __event_emitter__({
-                        "type": "message",
-                        "data": {
-                            "content": f"### 🎭 Discussion Created!\n\n"
-                                      f"**Topic**: {topic}\n\n"
-                                      f"**Agents**:\n{roles_text}\n\n"
-                                      f"**Discussion ID**: `{discussion_id}`\n\n"
-                                      f"The AI agents are now discussing. Messages will appear below in real-time."
-                        }
-                    })
+            # Emit roles info
+            roles_text = "\n".join(
+                f"  • **{role['name']}** ({role['model']}): {role['expertise']}"
+                for role in data["roles"]
+            )
 
-                    await __event_emitter__({
-                        "type": "status",
-                        "data": {
-                            "description": "✅ Discussion started successfully",
-                            "done": True
-                        }
-                    })
+            # Open WebUI has no combined message+status event; start both at once
+            await asyncio.gather(
+                self._emit(__event_emitter__, {
+                    "type": "message",
+                    "data": {
+                        "content": "".join((
+                            "### 🎭 Discussion Created!\n\n**Topic**: ", topic,
+                            "\n\n**Agents**:\n", roles_text,
+                            "\n\n**Discussion ID**: `", discussion_id,
+                            "`\n\nThe AI agents are now discussing. "
+                            "Messages will appear below in real-time."
+                        ))
+                    }
+                }),
+                self._emit(__event_emitter__, {
+                    "type": "status",
+                    "data": {
+                        "description": "✅ Discussion started successfully",
+                        "done": True
+                    }
+                })
+            )
 
-                return discussion_id
+            # Push agent messages to the chat as they arrive instead of polling
+            if __event_emitter__ is not None:
+                self.active_discussions[discussion_id]["ws_task"] = asyncio.create_task(
+                    self._subscribe(discussion_id, __event_emitter__)
+                )
 
+            return discussion_id
+
+        except httpx.HTTPStatusError as e:
+            error_msg = f"Failed to create discussion: {e.response.text}"
+            await self._emit(__event_emitter__, {
+                "type": "status",
+                "data": {
+                    "description": f"❌ {error_msg}",
+                    "done": True
+                }
+            })
+            return error_msg
         except httpx.TimeoutException:
             error_msg = "⏱️ Request timeout - API may be slow or unavailable"
-            if __event_emitter__:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {"description": error_msg, "done": True}
-                })
+            await self._emit(__event_emitter__, {
+                "type": "status",
+                "data": {"description": error_msg, "done": True}
+            })
             return error_msg
         except Exception as e:
             error_msg = f"❌ Error creating discussion: {str(e)}"
-            if __event_emitter__:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {"description": error_msg, "done": True}
-                })
+            await self._emit(__event_emitter__, {
+                "type": "status",
+                "data": {"description": error_msg, "done": True}
+            })
             return error_msg
 
     async def send_message_to_discussion(
@@ -206,6 +619,8 @@ class Tools:
         Returns:
             Status message
         """
+        self._touch(discussion_id)
+
         if __event_emitter__:
             await __event_emitter__({
                 "type": "status",
@@ -216,43 +631,46 @@ class Tools:
             })
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.valves.API_ENDPOINT}/api/discussions/{discussion_id}/message",
-                    json={
-                        "content": message,
-                        "user_id": user_id
-                    }
+            session = self._get_session()
+            async with session.post(
+                f"/api/discussions/{discussion_id}/message",
+                headers=_JSON_HEADERS,
+                data=_json_dumps({
+                    "content": message,
+                    "user_id": user_id
+                })
+            ) as response:
+                response_text = await response.text()
+                response.raise_for_status()
+
+            if __event_emitter__:
+                await asyncio.gather(
+                    __event_emitter__({
+                        "type": "message",
+                        "data": {
+                            "content": f"### 👤 Your message\n\n{message}\n\n"
+                                      f"*The AI agents are considering your input...*"
+                        }
+                    }),
+                    __event_emitter__({
+                        "type": "status",
+                        "data": {
+                            "description": "✅ Message sent successfully",
+                            "done": True
+                        }
+                    })
                 )
 
-                if response.status_code == 200:
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "message",
-                            "data": {
-                                "content": f"### 👤 Your message\n\n{message}\n\n"
-                                          f"*The AI agents are considering your input...*"
-                            }
-                        })
-
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {
-                                "description": "✅ Message sent successfully",
-                                "done": True
-                            }
-                        })
-
-                    return "Message sent successfully"
-                else:
-                    error_msg = f"Failed to send message: {response.text}"
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {"description": f"❌ {error_msg}", "done": True}
-                        })
-                    return error_msg
+            return "Message sent successfully"
 
+        except aiohttp.ClientResponseError:
+            error_msg = f"Failed to send message: {response_text}"
+            if __event_emitter__:
+                await __event_emitter__({
+                    "type": "status",
+                    "data": {"description": f"❌ {error_msg}", "done": True}
+                })
+            return error_msg
         except Exception as e:
             error_msg = f"Error sending message: {str(e)}"
             if __event_emitter__:
@@ -277,6 +695,8 @@ class Tools:
         Returns:
             Discussion status dict
         """
+        self._touch(discussion_id)
+
         if __event_emitter__:
             await __event_emitter__({
                 "type": "status",
@@ -287,72 +707,76 @@ class Tools:
             })
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Get discussion status
-                status_response = await client.get(
-                    f"{self.valves.API_ENDPOINT}/api/discussions/{discussion_id}"
-                )
-
-                # Get recent messages
-                messages_response = await client.get(
-                    f"{self.valves.API_ENDPOINT}/api/discussions/{discussion_id}/messages",
+            client = self._get_client()
+            # Get discussion status and recent messages concurrently
+            status_response, messages_response = await asyncio.gather(
+                client.get(f"/api/discussions/{discussion_id}"),
+                client.get(
+                    f"/api/discussions/{discussion_id}/messages",
                     params={"limit": 10, "offset": 0}
+                ),
+                return_exceptions=True
+            )
+
+            # Report which of the two requests failed, if any
+            for label, result in (("status", status_response), ("messages", messages_response)):
+                if isinstance(result, Exception):
+                    raise RuntimeError(f"{label} request failed: {result}") from result
+
+            status_response.raise_for_status()
+            messages_response.raise_for_status()
+
+            status_data = _json_loads(status_response.content)
+            messages_data = _json_loads(messages_response.content)
+
+            # Format status message
+            status_icon = _STATUS_ICONS.get(status_data["status"], "❓")
+
+            consensus_text = "✅ Yes" if status_data["consensus_reached"] else "⏳ In progress"
+
+            parts = [
+                f"### {status_icon} Discussion Status\n\n"
+                f"**Topic**: {status_data['topic']}\n"
+                f"**Status**: {status_data['status']}\n"
+                f"**Progress**: Turn {status_data['current_turn']} / {status_data['max_turns']}\n"
+                f"**Consensus**: {consensus_text}\n"
+                f"**Messages**: {status_data['message_count']}\n\n"
+            ]
+
+            # Add recent messages
+            if messages_data["messages"]:
+                parts.append("**Recent Messages**:\n\n")
+                for msg in messages_data["messages"][-5:]:  # Last 5 messages
+                    role_icon = "👤" if msg["is_user"] else "🤖"
+                    parts.append(f"{role_icon} **{msg['role_name']}**: {msg['content'][:100]}...\n\n")
+
+            status_message = "".join(parts)
+
+            if __event_emitter__:
+                await asyncio.gather(
+                    __event_emitter__({
+                        "type": "message",
+                        "data": {"content": status_message}
+                    }),
+                    __event_emitter__({
+                        "type": "status",
+                        "data": {
+                            "description": "✅ Status retrieved successfully",
+                            "done": True
+                        }
+                    })
                 )
 
-                if status_response.status_code == 200 and messages_response.status_code == 200:
-                    status_data = status_response.json()
-                    messages_data = messages_response.json()
-
-                    # Format status message
-                    status_icon = {
-                        "running": "🔄",
-                        "completed": "✅",
-                        "stopped": "⏸️",
-                        "failed": "❌"
-                    }.get(status_data["status"], "❓")
-
-                    consensus_text = "✅ Yes" if status_data["consensus_reached"] else "⏳ In progress"
-
-                    status_message = (
-                        f"### {status_icon} Discussion Status\n\n"
-                        f"**Topic**: {status_data['topic']}\n"
-                        f"**Status**: {status_data['status']}\n"
-                        f"**Progress**: Turn {status_data['current_turn']} / {status_data['max_turns']}\n"
-                        f"**Consensus**: {consensus_text}\n"
-                        f"**Messages**: {status_data['message_count']}\n\n"
-                    )
-
-                    # Add recent messages
-                    if messages_data["messages"]:
-                        status_message += "**Recent Messages**:\n\n"
-                        for msg in messages_data["messages"][-5:]:  # Last 5 messages
-                            role_icon = "👤" if msg["is_user"] else "🤖"
-                            status_message += f"{role_icon} **{msg['role_name']}**: {msg['content'][:100]}...\n\n"
-
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "message",
-                            "data": {"content": status_message}
-                        })
-
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {
-                                "description": "✅ Status retrieved successfully",
-                                "done": True
-                            }
-                        })
-
-                    return status_data
-                else:
-                    error_msg = "Failed to fetch discussion status"
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {"description": f"❌ {error_msg}", "done": True}
-                        })
-                    return {"error": error_msg}
+            return status_data
 
+        except httpx.HTTPStatusError:
+            error_msg = "Failed to fetch discussion status"
+            if __event_emitter__:
+                await __event_emitter__({
+                    "type": "status",
+                    "data": {"description": f"❌ {error_msg}", "done": True}
+                })
+            return {"error": error_msg}
         except Exception as e:
             error_msg = f"Error fetching status: {str(e)}"
             if __event_emitter__:
@@ -387,42 +811,44 @@ class Tools:
             })
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.valves.API_ENDPOINT}/api/discussions/{discussion_id}/stop"
+            client = self._get_client()
+            response = await client.post(
+                f"/api/discussions/{discussion_id}/stop"
+            )
+
+            response.raise_for_status()
+
+            if __event_emitter__:
+                await asyncio.gather(
+                    __event_emitter__({
+                        "type": "message",
+                        "data": {
+                            "content": f"### ⏸️ Discussion Stopped\n\n"
+                                      f"The discussion has been stopped. You can view the messages above."
+                        }
+                    }),
+                    __event_emitter__({
+                        "type": "status",
+                        "data": {
+                            "description": "✅ Discussion stopped successfully",
+                            "done": True
+                        }
+                    })
                 )
 
-                if response.status_code == 200:
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "message",
-                            "data": {
-                                "content": f"### ⏸️ Discussion Stopped\n\n"
-                                          f"The discussion has been stopped. You can view the messages above."
-                            }
-                        })
-
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {
-                                "description": "✅ Discussion stopped successfully",
-                                "done": True
-                            }
-                        })
-
-                    # Remove from active discussions
-                    self.active_discussions.pop(discussion_id, None)
-
-                    return "Discussion stopped successfully"
-                else:
-                    error_msg = f"Failed to stop discussion: {response.text}"
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {"description": f"❌ {error_msg}", "done": True}
-                        })
-                    return error_msg
+            # Remove from active discussions
+            self._cancel_subscription(self.active_discussions.pop(discussion_id, None))
 
+            return "Discussion stopped successfully"
+
+        except httpx.HTTPStatusError as e:
+            error_msg = f"Failed to stop discussion: {e.response.text}"
+            if __event_emitter__:
+                await __event_emitter__({
+                    "type": "status",
+                    "data": {"description": f"❌ {error_msg}", "done": True}
+                })
+            return error_msg
         except Exception as e:
             error_msg = f"Error stopping discussion: {str(e)}"
             if __event_emitter__:
@@ -455,54 +881,68 @@ class Tools:
             })
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.valves.API_ENDPOINT}/api/models/"
-                )
+            base_url = self.valves.API_ENDPOINT.rstrip("/")
+
+            # One fetch per TTL window; concurrent callers wait for it
+            async with self._models_lock:
+                cached = self._models_cache
+                if (
+                    cached is not None
+                    and cached[0] == base_url
+                    and time.monotonic() - cached[1] < self._models_ttl
+                ):
+                    output = cached[2]
+                else:
+                    client = self._get_client()
+                    response = await client.get("/api/models/")
+                    response.raise_for_status()
 
-                if response.status_code == 200:
-                    data = response.json()
-                    models_by_provider = {}
+                    data = _json_loads(response.content)
+                    models_by_provider = defaultdict(list)
 
                     for model in data["models"]:
-                        provider = model["provider"]
-                        if provider not in models_by_provider:
-                            models_by_provider[provider] = []
-                        models_by_provider[provider].append(model)
+                        models_by_provider[model["provider"]].append(model)
 
                     # Format output
-                    output = "### 🤖 Available LLM Models\n\n"
+                    parts = ["### 🤖 Available LLM Models\n\n"]
 
                     for provider, models in models_by_provider.items():
-                        output += f"**{provider}**:\n"
-                        for model in models:
-                            output += f"  • **{model['name']}** - {model['context_length']:,} tokens\n"
-                        output += "\n"
-
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "message",
-                            "data": {"content": output}
-                        })
-
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {
-                                "description": "✅ Models retrieved successfully",
-                                "done": True
-                            }
-                        })
-
-                    return output
-                else:
-                    error_msg = "Failed to fetch models"
-                    if __event_emitter__:
-                        await __event_emitter__({
-                            "type": "status",
-                            "data": {"description": f"❌ {error_msg}", "done": True}
-                        })
-                    return error_msg
+                        parts.append(f"**{provider}**:\n")
+                        parts.extend(
+                            f"  • **{model['name']}** - {model['context_length']:,} tokens\n"
+                            for model in models
+                        )
+                        parts.append("\n")
 
+                    output = "".join(parts)
+
+                    self._models_cache = (base_url, time.monotonic(), output)
+
+            if __event_emitter__:
+                await asyncio.gather(
+                    __event_emitter__({
+                        "type": "message",
+                        "data": {"content": output}
+                    }),
+                    __event_emitter__({
+                        "type": "status",
+                        "data": {
+                            "description": "✅ Models retrieved successfully",
+                            "done": True
+                        }
+                    })
+                )
+
+            return output
+
+        except httpx.HTTPStatusError:
+            error_msg = "Failed to fetch models"
+            if __event_emitter__:
+                await __event_emitter__({
+                    "type": "status",
+                    "data": {"description": f"❌ {error_msg}", "done": True}
+                })
+            return error_msg
         except Exception as e:
             error_msg = f"Error fetching models: {str(e)}"
             if __event_emitter__:
@@ -522,6 +962,10 @@ class Action:
     def __init__(self):
         self.tools = Tools()
 
+    async def on_shutdown(self):
+        """Release the pooled HTTP client and session when the function unloads"""
+        await self.tools._aclose()
+
     async def action(
         self,
         body: dict,
@@ -538,13 +982,16 @@ class Action:
         - "stop discussion"
         - "list models"
         """
-        user_message = body.get("messages", [{}])[-1].get("content", "").lower()
+        user_message = body.get("messages", [{}])[-1].get("content", "")
         user_id = __user__.get("id", "anonymous")
 
         # Parse commands
-        if "start discussion" in user_message or "create discussion" in user_message:
+        match = _CMD_RE.match(user_message)
+        command = match.lastgroup if match else None
+
+        if command == "start":
             # Extract topic
-            topic = user_message.split("about", 1)[-1].strip()
+            topic = _ABOUT_RE.split(user_message, 1)[-1].strip()
             if not topic or len(topic) < 10:
                 return "Please provide a discussion topic. Example: 'Start discussion about climate change solutions'"
 
@@ -556,12 +1003,12 @@ class Action:
 
             return f"Discussion created: {discussion_id}"
 
-        elif "send message" in user_message:
+        elif command == "send":
             # Requires active discussion
-            if not self.tools.active_discussions:
+            discussion_id = self.tools._most_recent_discussion()
+            if discussion_id is None:
                 return "No active discussions. Start one first with: 'start discussion about [topic]'"
 
-            discussion_id = list(self.tools.active_discussions.keys())[-1]
             message_content = user_message.split(":", 1)[-1].strip()
 
             return await self.tools.send_message_to_discussion(
@@ -571,11 +1018,11 @@ class Action:
                 __event_emitter__=__event_emitter__
             )
 
-        elif "status" in user_message or "show discussion" in user_message:
-            if not self.tools.active_discussions:
+        elif command == "status":
+            discussion_id = self.tools._most_recent_discussion()
+            if discussion_id is None:
                 return "No active discussions."
 
-            discussion_id = list(self.tools.active_discussions.keys())[-1]
             await self.tools.get_discussion_status(
                 discussion_id=discussion_id,
                 __event_emitter__=__event_emitter__
@@ -583,17 +1030,17 @@ class Action:
 
             return "Status displayed above"
 
-        elif "stop" in user_message:
-            if not self.tools.active_discussions:
+        elif command == "stop":
+            discussion_id = self.tools._most_recent_discussion()
+            if discussion_id is None:
                 return "No active discussions to stop."
 
-            discussion_id = list(self.tools.active_discussions.keys())[-1]
             return await self.tools.stop_discussion(
                 discussion_id=discussion_id,
                 __event_emitter__=__event_emitter__
             )
 
-        elif "list models" in user_message or "show models" in user_message:
+        elif command == "models":
             return await self.tools.list_models(__event_emitter__=__event_emitter__)
 
         else:
@@ -9,86 +9,209 @@ Usage:
     python3 test_integration.py
     python3 test_integration.py --api-url http://custom-url:8007
     python3 test_integration.py --verbose
+    python3 test_integration.py --quiet     # plain output, e.g. for CI
 """
 
 import argparse
 import asyncio
+import importlib.util
 import json
 import sys
 import time
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any
 
 try:
     import httpx
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
 except ImportError:
     print("❌ Missing dependencies. Install with:")
     print("   pip install httpx rich")
     sys.exit(1)
 
-console = Console()
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder/decoder
+    orjson = None
 
 # Default API endpoint
 DEFAULT_API_URL = "http://192.168.110.199:8007"
-DEFAULT_TIMEOUT = 30.0
+# Fail fast when the API is unreachable, but allow slow responses
+DEFAULT_TIMEOUT = httpx.Timeout(connect=1.0, read=30.0, write=5.0, pool=1.0)
+HEALTH_TIMEOUT = httpx.Timeout(connect=1.0, read=5.0, write=5.0, pool=1.0)
+
+# Summary row label and style by test outcome
+RESULT_STYLES = {True: ("✅ PASS", "green"), False: ("❌ FAIL", "red")}
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# HTTP/2 multiplexes the concurrent test stages over one connection; it
+# needs the optional "h2" package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Ask for compressed bodies; Brotli only when a decoder is installed
+ACCEPT_ENCODING = (
+    "br, gzip, deflate"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip, deflate"
+)
+
+# rich is only imported for interactive runs; otherwise output is plain text
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a request body to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Decode a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_pretty(obj: Any) -> str:
+    """Format a payload for verbose logging"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of a single integration test"""
+    name: str
+    passed: bool
+    message: str
 
 
 class IntegrationTester:
     """Test suite for CAMEL Discussion API integration"""
 
-    def __init__(self, api_url: str, verbose: bool = False):
+    # The user message body never changes, so it is encoded once
+    _MSG_PAYLOAD = _json_dumps({
+        "content": "This is a test message from integration testing.",
+        "user_id": "test_user_integration"
+    })
+
+    def __init__(self, api_url: str, verbose: bool = False, plain: bool = False):
         self.api_url = api_url.rstrip('/')
         self.verbose = verbose
-        self.test_results = []
+        self.console = None
+        if not plain:
+            from rich.console import Console
+            self.console = Console()
+        self.test_results: List[TestResult] = []
         self.discussion_id: Optional[str] = None
+        self._disc_path: Optional[str] = None
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "IntegrationTester":
+        # One keep-alive client for the whole run instead of one per test
+        self.client = httpx.AsyncClient(
+            base_url=self.api_url,
+            timeout=DEFAULT_TIMEOUT,
+            http2=HTTP2_AVAILABLE,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=300
+            )
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
 
-    def log(self, message: str):
-        """Log verbose messages"""
+    def say(self, markup: str, text: str):
+        """Print rich markup, or the plain-text variant without a console"""
+        if self.console is not None:
+            self.console.print(markup)
+        else:
+            print(text)
+
+    def log(self, message: str, *args: Any):
+        """
+        Log verbose messages
+
+        Arguments are %-formatted into the message only when verbose output
+        is on, so quiet runs skip the string building.
+        """
         if self.verbose:
-            console.print(f"  [dim]{message}[/dim]")
+            if args:
+                message = message % args
+            self.say(f"  [dim]{message}[/dim]", f"  {message}")
 
     def record_result(self, test_name: str, passed: bool, message: str):
         """Record test result"""
-        self.test_results.append({
-            "name": test_name,
-            "passed": passed,
-            "message": message
-        })
+        self.test_results.append(TestResult(test_name, passed, message))
 
         if passed:
-            console.print(f"✅ {test_name}: [green]{message}[/green]")
+            self.say(f"✅ {test_name}: [green]{message}[/green]", f"✅ {test_name}: {message}")
         else:
-            console.print(f"❌ {test_name}: [red]{message}[/red]")
+            self.say(f"❌ {test_name}: [red]{message}[/red]", f"❌ {test_name}: {message}")
+
+    async def _await_status(self) -> Optional[str]:
+        """
+        Poll the new discussion with short backoff until it is readable
+
+        Replaces a fixed sleep between creation and the tests that read it.
+
+        Returns:
+            The discussion status, or None if it never became readable
+        """
+        for delay in (0, 0.02, 0.05, 0.1, 0.2):
+            await asyncio.sleep(delay)
+            try:
+                response = await self.client.get(
+                    self._disc_path
+                )
+            except httpx.HTTPError:
+                continue
+            if response.status_code == 200:
+                status = _json_loads(response.content).get("status")
+                if status != "creating":
+                    return status
+        return None
+
+    async def _request_json(self, method: str, path: str, **kwargs) -> Any:
+        """
+        Send a request on the shared client and decode its JSON body
+
+        Raises:
+            httpx.HTTPStatusError: If the API answers with an error status
+        """
+        response = await self.client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return _json_loads(response.content)
 
     async def test_health_check(self) -> bool:
         """Test 1: API Health Check"""
         test_name = "Health Check"
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                self.log(f"GET {self.api_url}/health")
-                response = await client.get(f"{self.api_url}/health")
-
-                if response.status_code != 200:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}")
-                    return False
-
-                data = response.json()
-                status = data.get("status")
-
-                if status == "healthy":
-                    self.record_result(test_name, True,
-                                     f"API is healthy (v{data.get('version', 'unknown')})")
-                    return True
-                else:
-                    self.record_result(test_name, False,
-                                     f"Unexpected status: {status}")
-                    return False
+            self.log("GET /health")
+            data = await self._request_json("GET", "/health", timeout=HEALTH_TIMEOUT)
+            status = data.get("status")
 
+            if status == "healthy":
+                self.record_result(test_name, True,
+                                 f"API is healthy (v{data.get('version', 'unknown')})")
+                return True
+            else:
+                self.record_result(test_name, False,
+                                 f"Unexpected status: {status}")
+                return False
+
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}")
+            return False
         except httpx.ConnectError:
             self.record_result(test_name, False,
                              f"Cannot connect to {self.api_url}")
@@ -105,27 +228,23 @@ class IntegrationTester:
         test_name = "List Models"
 
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-                self.log(f"GET {self.api_url}/api/models/")
-                response = await client.get(f"{self.api_url}/api/models/")
-
-                if response.status_code != 200:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}")
-                    return False
-
-                data = response.json()
-                models = data.get("models", [])
-
-                if len(models) > 0:
-                    model_names = [m.get("model_name") for m in models]
-                    self.record_result(test_name, True,
-                                     f"Found {len(models)} models: {', '.join(model_names[:3])}")
-                    return True
-                else:
-                    self.record_result(test_name, False, "No models available")
-                    return False
+            self.log("GET /api/models/")
+            data = await self._request_json("GET", "/api/models/")
+            models = data.get("models", [])
 
+            if len(models) > 0:
+                model_names = [m.get("model_name") for m in models]
+                self.record_result(test_name, True,
+                                 f"Found {len(models)} models: {', '.join(model_names[:3])}")
+                return True
+            else:
+                self.record_result(test_name, False, "No models available")
+                return False
+
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}")
+            return False
         except Exception as e:
             self.record_result(test_name, False, f"Error: {str(e)}")
             return False
@@ -135,40 +254,42 @@ class IntegrationTester:
         test_name = "Create Discussion"
 
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-                payload = {
-                    "topic": "Test discussion for integration verification",
-                    "num_agents": 3,
-                    "user_id": "test_user_integration",
-                    "max_turns": 5
-                }
-
-                self.log(f"POST {self.api_url}/api/discussions/create")
-                self.log(f"Payload: {json.dumps(payload, indent=2)}")
-
-                response = await client.post(
-                    f"{self.api_url}/api/discussions/create",
-                    json=payload
-                )
-
-                if response.status_code != 201:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}: {response.text}")
-                    return False
-
-                data = response.json()
-                self.discussion_id = data.get("discussion_id")
-                num_agents = len(data.get("roles", []))
+            payload = {
+                "topic": "Test discussion for integration verification",
+                "num_agents": 3,
+                "user_id": "test_user_integration",
+                "max_turns": 5
+            }
+
+            self.log("POST /api/discussions/create")
+            if self.verbose:
+                self.log("Payload: %s", _json_pretty(payload))
+
+            data = await self._request_json(
+                "POST",
+                "/api/discussions/create",
+                headers=JSON_HEADERS,
+                content=_json_dumps(payload)
+            )
+            self.discussion_id = data.get("discussion_id")
+            self._disc_path = f"/api/discussions/{self.discussion_id}"
+            num_agents = len(data.get("roles", []))
 
-                if self.discussion_id and num_agents == 3:
-                    self.record_result(test_name, True,
-                                     f"Created discussion {self.discussion_id} with {num_agents} agents")
-                    return True
-                else:
-                    self.record_result(test_name, False,
-                                     "Unexpected response format")
-                    return False
+            if self.discussion_id and num_agents == 3:
+                status = await self._await_status()
+                self.log("Discussion ready with status: %s", status)
+                self.record_result(test_name, True,
+                                 f"Created discussion {self.discussion_id} with {num_agents} agents")
+                return True
+            else:
+                self.record_result(test_name, False,
+                                 "Unexpected response format")
+                return False
 
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}: {e.response.text}")
+            return False
         except Exception as e:
             self.record_result(test_name, False, f"Error: {str(e)}")
             return False
@@ -182,30 +303,24 @@ class IntegrationTester:
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-                self.log(f"GET {self.api_url}/api/discussions/{self.discussion_id}")
-                response = await client.get(
-                    f"{self.api_url}/api/discussions/{self.discussion_id}"
-                )
-
-                if response.status_code != 200:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}")
-                    return False
+            self.log("GET %s", self._disc_path)
+            data = await self._request_json("GET", self._disc_path)
+            status = data.get("status")
+            turn = data.get("current_turn", 0)
 
-                data = response.json()
-                status = data.get("status")
-                turn = data.get("current_turn", 0)
-
-                if status in ["running", "waiting", "completed", "stopped"]:
-                    self.record_result(test_name, True,
-                                     f"Status: {status}, Turn: {turn}")
-                    return True
-                else:
-                    self.record_result(test_name, False,
-                                     f"Unexpected status: {status}")
-                    return False
+            if status in ["running", "waiting", "completed", "stopped"]:
+                self.record_result(test_name, True,
+                                 f"Status: {status}, Turn: {turn}")
+                return True
+            else:
+                self.record_result(test_name, False,
+                                 f"Unexpected status: {status}")
+                return False
 
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}")
+            return False
         except Exception as e:
             self.record_result(test_name, False, f"Error: {str(e)}")
             return False
@@ -219,32 +334,25 @@ class IntegrationTester:
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-                payload = {
-                    "content": "This is a test message from integration testing.",
-                    "user_id": "test_user_integration"
-                }
-
-                self.log(f"POST {self.api_url}/api/discussions/{self.discussion_id}/message")
-                response = await client.post(
-                    f"{self.api_url}/api/discussions/{self.discussion_id}/message",
-                    json=payload
-                )
-
-                if response.status_code != 200:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}")
-                    return False
-
-                data = response.json()
+            self.log("POST %s/message", self._disc_path)
+            data = await self._request_json(
+                "POST",
+                f"{self._disc_path}/message",
+                headers=JSON_HEADERS,
+                content=self._MSG_PAYLOAD
+            )
 
-                if data.get("status") == "sent":
-                    self.record_result(test_name, True, "Message sent successfully")
-                    return True
-                else:
-                    self.record_result(test_name, False, "Unexpected response")
-                    return False
+            if data.get("status") == "sent":
+                self.record_result(test_name, True, "Message sent successfully")
+                return True
+            else:
+                self.record_result(test_name, False, "Unexpected response")
+                return False
 
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}")
+            return False
         except Exception as e:
             self.record_result(test_name, False, f"Error: {str(e)}")
             return False
@@ -258,26 +366,32 @@ class IntegrationTester:
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-                self.log(f"GET {self.api_url}/api/discussions/{self.discussion_id}/messages")
-                response = await client.get(
-                    f"{self.api_url}/api/discussions/{self.discussion_id}/messages",
-                    params={"limit": 10}
-                )
-
-                if response.status_code != 200:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}")
-                    return False
-
-                data = response.json()
-                messages = data.get("messages", [])
-                total = data.get("total", 0)
-
-                self.record_result(test_name, True,
-                                 f"Retrieved {len(messages)}/{total} messages")
-                return True
-
+            self.log("GET %s/messages", self._disc_path)
+            # Stream the body into one buffer instead of letting httpx keep
+            # its own copy next to the parsed result
+            async with self.client.stream(
+                "GET",
+                f"{self._disc_path}/messages",
+                params={"limit": 10}
+            ) as response:
+                response.raise_for_status()
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+
+            data = _json_loads(body)
+            message_count = len(data.get("messages", []))
+            total = data.get("total", 0)
+
+            self.record_result(test_name, True,
+                             f"Retrieved {message_count}/{total} messages")
+            return True
+
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}")
+            return False
         except Exception as e:
             self.record_result(test_name, False, f"Error: {str(e)}")
             return False
@@ -291,70 +405,99 @@ class IntegrationTester:
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-                self.log(f"POST {self.api_url}/api/discussions/{self.discussion_id}/stop")
-                response = await client.post(
-                    f"{self.api_url}/api/discussions/{self.discussion_id}/stop"
-                )
-
-                if response.status_code != 200:
-                    self.record_result(test_name, False,
-                                     f"Status {response.status_code}")
-                    return False
-
-                data = response.json()
+            self.log("POST %s/stop", self._disc_path)
+            data = await self._request_json("POST", f"{self._disc_path}/stop")
 
-                if data.get("status") == "stopped":
-                    self.record_result(test_name, True, "Discussion stopped successfully")
-                    return True
-                else:
-                    self.record_result(test_name, False, "Unexpected response")
-                    return False
+            if data.get("status") == "stopped":
+                self.record_result(test_name, True, "Discussion stopped successfully")
+                return True
+            else:
+                self.record_result(test_name, False, "Unexpected response")
+                return False
 
+        except httpx.HTTPStatusError as e:
+            self.record_result(test_name, False,
+                             f"Status {e.response.status_code}")
+            return False
         except Exception as e:
             self.record_result(test_name, False, f"Error: {str(e)}")
             return False
 
     async def run_all_tests(self) -> bool:
         """Run complete test suite"""
-        console.print("\n[bold cyan]🧪 CAMEL Discussion Integration Test Suite[/bold cyan]\n")
-        console.print(f"Testing API: [yellow]{self.api_url}[/yellow]\n")
-
-        # Test sequence
-        tests = [
-            ("Health Check", self.test_health_check),
-            ("List Models", self.test_list_models),
-            ("Create Discussion", self.test_create_discussion),
-            ("Get Discussion Status", self.test_get_discussion),
-            ("Send User Message", self.test_send_message),
-            ("Get Discussion Messages", self.test_get_messages),
-            ("Stop Discussion", self.test_stop_discussion),
+        self.say("\n[bold cyan]🧪 CAMEL Discussion Integration Test Suite[/bold cyan]\n",
+                 "\n🧪 CAMEL Discussion Integration Test Suite\n")
+        self.say(f"Testing API: [yellow]{self.api_url}[/yellow]\n",
+                 f"Testing API: {self.api_url}\n")
+
+        # Test sequence, grouped into stages; tests within a stage are
+        # independent of each other and run concurrently
+        stages = [
+            [
+                ("Health Check", self.test_health_check),
+                ("List Models", self.test_list_models),
+            ],
+            [
+                ("Create Discussion", self.test_create_discussion),
+            ],
+            [
+                ("Get Discussion Status", self.test_get_discussion),
+                ("Send User Message", self.test_send_message),
+                ("Get Discussion Messages", self.test_get_messages),
+            ],
+            [
+                ("Stop Discussion", self.test_stop_discussion),
+            ],
         ]
 
-        for test_name, test_func in tests:
-            console.print(f"\n[bold]Testing: {test_name}[/bold]")
-            result = await test_func()
+        for stage in stages:
+            names = ", ".join(name for name, _ in stage)
+            self.say(f"\n[bold]Testing: {names}[/bold]", f"\nTesting: {names}")
+            results = await asyncio.gather(
+                *(test_func() for _, test_func in stage),
+                return_exceptions=True
+            )
 
             # If critical test fails, stop
-            if not result and test_name in ["Health Check", "Create Discussion"]:
-                console.print(f"\n[red]❌ Critical test '{test_name}' failed. Stopping tests.[/red]")
+            failed = [
+                test_name for (test_name, _), result in zip(stage, results)
+                if result is not True and test_name in ["Health Check", "Create Discussion"]
+            ]
+            if failed:
+                self.say(f"\n[red]❌ Critical test '{failed[0]}' failed. Stopping tests.[/red]",
+                         f"\n❌ Critical test '{failed[0]}' failed. Stopping tests.")
                 break
 
-            # Small delay between tests
-            await asyncio.sleep(0.5)
-
         # Print summary
         self.print_summary()
 
         # Return overall success
-        return all(r["passed"] for r in self.test_results)
+        return all(r.passed for r in self.test_results)
 
     def print_summary(self):
         """Print test summary"""
-        console.print("\n" + "="*60 + "\n")
+        print("\n" + "="*60 + "\n")
+
+        # Count passes and build the rows in one pass over the results
+        passed = 0
+        rows = []
+        for result in self.test_results:
+            passed += result.passed
+            rows.append((result.name, *RESULT_STYLES[result.passed], result.message))
+
+        total = len(rows)
+        success_rate = (passed / total * 100) if total > 0 else 0
+
+        if self.console is None:
+            for name, status, _, message in rows:
+                print(f"{status}  {name}: {message}")
+            print(f"\n{passed}/{total} tests passed ({success_rate:.1f}%)\n")
+            return
+
+        from rich.table import Table
+        from rich.panel import Panel
 
-        passed = sum(1 for r in self.test_results if r["passed"])
-        total = len(self.test_results)
+        console = self.console
 
         # Create summary table
         table = Table(title="Test Summary", show_header=True, header_style="bold cyan")
@@ -362,20 +505,12 @@ class IntegrationTester:
         table.add_column("Result", width=10)
         table.add_column("Details", style="dim")
 
-        for result in self.test_results:
-            status = "✅ PASS" if result["passed"] else "❌ FAIL"
-            status_style = "green" if result["passed"] else "red"
-            table.add_row(
-                result["name"],
-                f"[{status_style}]{status}[/{status_style}]",
-                result["message"]
-            )
+        for name, status, status_style, message in rows:
+            table.add_row(name, f"[{status_style}]{status}[/{status_style}]", message)
 
         console.print(table)
 
         # Overall result
-        success_rate = (passed / total * 100) if total > 0 else 0
-
         if passed == total:
             panel = Panel(
                 f"[bold green]✅ ALL TESTS PASSED ({passed}/{total})[/bold green]\n\n"
@@ -413,22 +548,34 @@ async def main():
         action="store_true",
         help="Enable verbose output"
     )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Plain-text output without rich formatting (default when not a TTY)"
+    )
 
     args = parser.parse_args()
 
-    # Create tester
-    tester = IntegrationTester(api_url=args.api_url, verbose=args.verbose)
-
-    # Run tests
-    success = await tester.run_all_tests()
+    # Create tester and run tests
+    plain = args.quiet or not sys.stdout.isatty() or not RICH_AVAILABLE
+    async with IntegrationTester(api_url=args.api_url, verbose=args.verbose, plain=plain) as tester:
+        success = await tester.run_all_tests()
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
+    # uvloop is optional; fall back to the default asyncio loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        console.print("\n\n[yellow]Tests interrupted by user[/yellow]")
+        print("\n\nTests interrupted by user")
         sys.exit(130)
@@ -8,12 +8,14 @@ Usage:
 import asyncio
 import sys
 import argparse
+import importlib.util
 import os
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import httpx
 from dotenv import load_dotenv
 from loguru import logger
 
@@ -23,7 +25,8 @@ from src.camel_engine.orchestrator import DiscussionOrchestrator
 async def test_discussion(
     topic: str,
     num_agents: int = 3,
-    max_turns: int = 10
+    max_turns: int = 10,
+    parallel_rounds: bool = False
 ):
     """
     Test a complete discussion
@@ -32,6 +35,7 @@ async def test_discussion(
         topic: Discussion topic
         num_agents: Number of expert agents
         max_turns: Maximum turns to run
+        parallel_rounds: Generate opening statements concurrently
     """
     # Load environment
     load_dotenv()
@@ -51,10 +55,19 @@ async def test_discussion(
     logger.info(f"Max Turns: {max_turns}")
     logger.info("=" * 80)
 
+    # One keep-alive client for every LLM call in the run, so agents reuse
+    # the TLS session to OpenRouter instead of reconnecting per turn
+    http_client = httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=num_agents * 2, keepalive_expiry=300),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+
     # Create orchestrator
     orchestrator = DiscussionOrchestrator(
         openrouter_api_key=api_key,
-        max_turns=max_turns
+        max_turns=max_turns,
+        http_client=http_client
     )
 
     try:
@@ -77,7 +90,11 @@ async def test_discussion(
         print(f"\n🎯 Starting discussion...")
         print("-" * 80)
 
-        result = await orchestrator.run_discussion(discussion_id, max_turns=max_turns)
+        result = await orchestrator.run_discussion(
+            discussion_id,
+            max_turns=max_turns,
+            parallel_rounds=parallel_rounds
+        )
 
         # Display results
         print("-" * 80)
@@ -110,13 +127,13 @@ async def test_discussion(
 
         print(f"\n**Full Conversation** ({len(result.messages)} messages):")
         print("=" * 80)
-        for msg in result.messages:
-            if msg.role_name == "System":
-                print(f"\n[{msg.role_name}] {msg.content}\n")
-            else:
-                print(f"\n**Turn {msg.turn_number} - {msg.role_name}** ({msg.model}):")
-                print(f"{msg.content}")
-                print()
+        # Format the whole transcript first and write it in one call
+        sys.stdout.write("".join(
+            f"\n[{msg.role_name}] {msg.content}\n\n"
+            if msg.role_name == "System"
+            else f"\n**Turn {msg.turn_number} - {msg.role_name}** ({msg.model}):\n{msg.content}\n\n"
+            for msg in result.messages
+        ))
 
         print("=" * 80)
         print("✅ Test completed successfully!")
@@ -125,6 +142,8 @@ async def test_discussion(
         logger.exception("Test failed")
         print(f"\n❌ Error: {str(e)}")
         raise
+    finally:
+        await http_client.aclose()
 
 
 def main():
@@ -160,13 +179,27 @@ Examples:
         help="Maximum discussion turns (default: 10)"
     )
 
+    parser.add_argument(
+        "--parallel-rounds",
+        action="store_true",
+        help="Collect all opening statements concurrently"
+    )
+
     args = parser.parse_args()
 
+    # uvloop is optional; fall back to the default asyncio loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Run test
     asyncio.run(test_discussion(
         topic=args.topic,
         num_agents=args.num_agents,
-        max_turns=args.max_turns
+        max_turns=args.max_turns,
+        parallel_rounds=args.parallel_rounds
     ))
 
 
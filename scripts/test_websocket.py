@@ -4,47 +4,121 @@ WebSocket Test Script
 Tests real-time WebSocket communication with the discussion API
 """
 import asyncio
+import importlib.util
 import websockets
 import json
+import socket
 import sys
+from collections import deque
 from datetime import datetime
-import requests
-from rich.console import Console
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import urlsplit
+import httpx
+from rich.console import Console, Group
 from rich.table import Table
 from rich.live import Live
 from rich.panel import Panel
+from rich.style import Style
 from rich.text import Text
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
+# Every received frame is parsed; use the C parser when it is available.
+# The API sends JSON as binary frames, so messages arrive as bytes (no
+# UTF-8 validation or decode) and both parsers accept them directly
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_pretty(data) -> str:
+    """Indented JSON for display"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 console = Console()
 
 API_URL = "http://localhost:8007"
 WS_URL = "ws://localhost:8007"
 
+# Shared stand-in for a missing "data" payload
+_EMPTY = MappingProxyType({})
+
+# Panels kept in the live view; older ones are printed above it
+LIVE_PANELS = 4
+
+# Styles for message bodies; content is assembled as Text so it skips the
+# markup parser (and can't be mangled by brackets in agent output)
+_STYLE_BOLD = Style(bold=True)
+_STYLE_DIM = Style(dim=True)
+_STYLE_ROLE = Style(bold=True, color="cyan")
+_STYLE_USER = Style(bold=True, color="yellow")
+_STYLE_ERROR = Style(bold=True, color="red")
+_STYLE_GREEN = Style(color="green")
+_STYLE_YELLOW = Style(color="yellow")
+
+# Panels whose content never changes are built once
+_STOPPED_PANEL = Panel(
+    Text("Discussion stopped by user", style=_STYLE_YELLOW),
+    title="Stopped",
+    border_style="yellow"
+)
+
+
+def format_time(timestamp):
+    """Return HH:MM:SS for an ISO-8601 timestamp (current time if missing)"""
+    if timestamp is None:
+        return datetime.utcnow().strftime("%H:%M:%S")
+    # The API sends isoformat() strings; the time is at a fixed offset
+    if len(timestamp) >= 19 and timestamp[10] == "T":
+        return timestamp[11:19]
+    return _parse_time(timestamp)
+
+
+@lru_cache(maxsize=1024)
+def _parse_time(timestamp: str) -> str:
+    """Slow path for timestamps that aren't plain isoformat() output"""
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime("%H:%M:%S")
+
 
 class WebSocketTester:
     """WebSocket test client"""
 
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
         self.discussion_id = None
         self.websocket = None
-        self.messages = []
-        self.running = False
+        self.message_count = 0
+        self._recent = deque(maxlen=LIVE_PANELS)
+        self._live = None
+        self._handlers = {
+            "connected": self._on_connected,
+            "agent_message": self._on_agent,
+            "agent_messages_batch": self._on_agent_batch,
+            "user_message": self._on_user,
+            "consensus_update": self._on_consensus,
+            "discussion_complete": self._on_complete,
+            "error": self._on_error,
+            "discussion_stopped": self._on_stopped,
+        }
 
     async def create_discussion(self, topic: str, num_agents: int = 3):
         """Create a discussion via REST API"""
         console.print("\n[bold blue]Creating discussion...[/bold blue]")
 
         try:
-            response = requests.post(
-                f"{API_URL}/api/discussions/create",
+            response = await self.client.post(
+                "/api/discussions/create",
                 json={
                     "topic": topic,
                     "num_agents": num_agents,
                     "model_preferences": ["gpt-4", "claude-3-opus"],
                     "user_id": "websocket_test_user",
                     "max_turns": 10
-                },
-                timeout=30
+                }
             )
 
             if response.status_code == 201:
@@ -76,156 +150,143 @@ class WebSocketTester:
             console.print(f"[red]✗ Error creating discussion: {e}[/red]")
             return False
 
-    async def connect_websocket(self):
-        """Connect to WebSocket endpoint"""
+    def connect_websocket(self):
+        """Return a WebSocket connection to the discussion, for use with `async with`"""
         console.print(f"\n[bold blue]Connecting to WebSocket...[/bold blue]")
 
-        try:
-            ws_url = f"{WS_URL}/ws/discussions/{self.discussion_id}"
-            console.print(f"[dim]URL: {ws_url}[/dim]")
-
-            self.websocket = await websockets.connect(ws_url)
-            console.print("[green]✓ WebSocket connected[/green]")
-            return True
-
-        except Exception as e:
-            console.print(f"[red]✗ WebSocket connection failed: {e}[/red]")
-            return False
+        ws_url = f"{WS_URL}/ws/discussions/{self.discussion_id}"
+        console.print(f"[dim]URL: {ws_url}[/dim]")
+
+        # Local test traffic: skip per-message deflate/inflate
+        return websockets.connect(
+            ws_url,
+            compression=None,
+            ping_interval=20,
+            ping_timeout=20
+        )
+
+    def _render(self, renderable):
+        """Show output in the live view; older panels scroll into the console"""
+        if len(self._recent) == self._recent.maxlen:
+            self._live.console.print(self._recent[0])
+        self._recent.append(renderable)
+        self._live.update(Group(*self._recent))
+
+    def _on_connected(self, data, time_str):
+        self._render(Panel(
+            Text(f"Connected to discussion {data['discussion_id'][:8]}...", style=_STYLE_GREEN),
+            title="Connected",
+            border_style="green"
+        ))
+
+    def _on_agent(self, data, time_str):
+        agent_data = data.get("data") or _EMPTY
+        role = agent_data.get("role_name", "Unknown")
+        model = agent_data.get("model", "Unknown")
+        content = agent_data.get("content", "")
+        turn = agent_data.get("turn_number", "?")
+
+        self._render(Panel(
+            Text.assemble((role, _STYLE_ROLE), " ", (f"({model})", _STYLE_DIM), "\n\n", content),
+            title=f"Turn {turn} • {time_str}",
+            border_style="cyan"
+        ))
+
+    def _on_agent_batch(self, data, time_str):
+        for agent_data in data.get("data") or ():
+            self._on_agent({"data": agent_data}, time_str)
+
+    def _on_user(self, data, time_str):
+        content = (data.get("data") or _EMPTY).get("content", "")
+
+        self._render(Panel(
+            Text.assemble(("User:", _STYLE_USER), "\n\n", content),
+            title=f"User Message • {time_str}",
+            border_style="yellow"
+        ))
+
+    def _on_consensus(self, data, time_str):
+        consensus_data = data.get("data") or _EMPTY
+        reached = consensus_data.get("reached", False)
+        confidence = consensus_data.get("confidence", 0)
+        summary = consensus_data.get("summary", "")
+
+        status = "✓ REACHED" if reached else "In Progress"
+        color = "green" if reached else "yellow"
+
+        self._render(Panel(
+            Text.assemble(
+                ("Status:", _STYLE_BOLD), " ",
+                (status, _STYLE_GREEN if reached else _STYLE_YELLOW), "\n",
+                ("Confidence:", _STYLE_BOLD), f" {confidence:.1%}\n\n",
+                summary
+            ),
+            title=f"Consensus Update • {time_str}",
+            border_style=color
+        ))
+
+    def _on_complete(self, data, time_str):
+        complete_data = data.get("data") or _EMPTY
+        total_turns = complete_data.get("total_turns", 0)
+        consensus = complete_data.get("consensus_reached", False)
+        summary = complete_data.get("final_summary", "")
+
+        self._render(Panel(
+            Text.assemble(
+                ("Total Turns:", _STYLE_BOLD), f" {total_turns}\n",
+                ("Consensus:", _STYLE_BOLD), f" {'Yes ✓' if consensus else 'No ✗'}\n\n",
+                summary
+            ),
+            title="Discussion Complete",
+            border_style="green"
+        ))
+        return True
+
+    def _on_error(self, data, time_str):
+        error = data.get("error", "Unknown error")
+        self._render(Panel(
+            Text(error, style=_STYLE_ERROR),
+            title="Error",
+            border_style="red"
+        ))
+
+    def _on_stopped(self, data, time_str):
+        self._render(_STOPPED_PANEL)
+        return True
+
+    def _on_unknown(self, data, time_str):
+        self._render(Panel(
+            Text(json_pretty(data), style=_STYLE_DIM),
+            title=f"Unknown message type: {data.get('type', 'unknown')}",
+            border_style="dim"
+        ))
 
     async def receive_messages(self):
         """Receive and display WebSocket messages"""
         console.print("\n[bold blue]Listening for messages...[/bold blue]")
         console.print("[dim]Press Ctrl+C to stop[/dim]\n")
 
-        self.running = True
-        message_count = 0
+        # Live redraws at a fixed rate however fast messages arrive
+        with Live(console=console, refresh_per_second=10) as self._live:
+            try:
+                async for message in self.websocket:
+                    data = json_loads(message)
+                    self.message_count += 1
 
-        try:
-            async for message in self.websocket:
-                if not self.running:
-                    break
-
-                data = json.loads(message)
-                message_count += 1
-
-                # Format timestamp
-                timestamp = data.get("timestamp", datetime.utcnow().isoformat())
-                time_str = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime("%H:%M:%S")
-
-                # Display based on message type
-                msg_type = data.get("type", "unknown")
-
-                if msg_type == "connected":
-                    console.print(Panel(
-                        f"[green]Connected to discussion {data['discussion_id'][:8]}...[/green]",
-                        title="Connected",
-                        border_style="green"
-                    ))
-
-                elif msg_type == "agent_message":
-                    agent_data = data.get("data", {})
-                    role = agent_data.get("role_name", "Unknown")
-                    model = agent_data.get("model", "Unknown")
-                    content = agent_data.get("content", "")
-                    turn = agent_data.get("turn_number", "?")
-
-                    console.print(Panel(
-                        f"[bold cyan]{role}[/bold cyan] [dim]({model})[/dim]\n\n{content}",
-                        title=f"Turn {turn} • {time_str}",
-                        border_style="cyan"
-                    ))
-
-                elif msg_type == "user_message":
-                    user_data = data.get("data", {})
-                    content = user_data.get("content", "")
-
-                    console.print(Panel(
-                        f"[bold yellow]User:[/bold yellow]\n\n{content}",
-                        title=f"User Message • {time_str}",
-                        border_style="yellow"
-                    ))
-
-                elif msg_type == "consensus_update":
-                    consensus_data = data.get("data", {})
-                    reached = consensus_data.get("reached", False)
-                    confidence = consensus_data.get("confidence", 0)
-                    summary = consensus_data.get("summary", "")
-
-                    status = "✓ REACHED" if reached else "In Progress"
-                    color = "green" if reached else "yellow"
-
-                    console.print(Panel(
-                        f"[bold]Status:[/bold] [{color}]{status}[/{color}]\n"
-                        f"[bold]Confidence:[/bold] {confidence:.1%}\n\n"
-                        f"{summary}",
-                        title=f"Consensus Update • {time_str}",
-                        border_style=color
-                    ))
-
-                elif msg_type == "discussion_complete":
-                    complete_data = data.get("data", {})
-                    total_turns = complete_data.get("total_turns", 0)
-                    consensus = complete_data.get("consensus_reached", False)
-                    summary = complete_data.get("final_summary", "")
-
-                    console.print(Panel(
-                        f"[bold]Total Turns:[/bold] {total_turns}\n"
-                        f"[bold]Consensus:[/bold] {'Yes ✓' if consensus else 'No ✗'}\n\n"
-                        f"{summary}",
-                        title="Discussion Complete",
-                        border_style="green"
-                    ))
-
-                    console.print(f"\n[bold green]Discussion finished after {total_turns} turns![/bold green]")
-                    break
-
-                elif msg_type == "error":
-                    error = data.get("error", "Unknown error")
-                    console.print(Panel(
-                        f"[bold red]{error}[/bold red]",
-                        title="Error",
-                        border_style="red"
-                    ))
-
-                elif msg_type == "discussion_stopped":
-                    console.print(Panel(
-                        "[yellow]Discussion stopped by user[/yellow]",
-                        title="Stopped",
-                        border_style="yellow"
-                    ))
-                    break
-
-                else:
-                    console.print(f"[dim]Unknown message type: {msg_type}[/dim]")
-                    console.print(f"[dim]{json.dumps(data, indent=2)}[/dim]")
-
-                # Store message
-                self.messages.append(data)
-
-        except KeyboardInterrupt:
-            console.print("\n[yellow]Interrupted by user[/yellow]")
-        except Exception as e:
-            console.print(f"\n[red]Error receiving messages: {e}[/red]")
-        finally:
-            console.print(f"\n[bold]Total messages received: {message_count}[/bold]")
+                    # Format timestamp
+                    time_str = format_time(data.get("timestamp"))
 
-    async def send_ping(self):
-        """Send periodic ping messages"""
-        try:
-            while self.running:
-                await asyncio.sleep(30)
-                if self.websocket:
-                    await self.websocket.send("ping")
-                    console.print("[dim]→ Sent ping[/dim]")
-        except Exception:
-            pass
-
-    async def close(self):
-        """Close WebSocket connection"""
-        self.running = False
-        if self.websocket:
-            await self.websocket.close()
-            console.print("[green]✓ WebSocket closed[/green]")
+                    # Display based on message type; handlers return True to stop
+                    handler = self._handlers.get(data.get("type"), self._on_unknown)
+                    if handler(data, time_str):
+                        break
+
+            except KeyboardInterrupt:
+                self._render("\n[yellow]Interrupted by user[/yellow]")
+            except Exception as e:
+                self._render(f"\n[red]Error receiving messages: {e}[/red]")
+
+        console.print(f"\n[bold]Total messages received: {self.message_count}[/bold]")
 
     async def run(self, topic: str, num_agents: int = 3):
         """Run complete test"""
@@ -234,26 +295,21 @@ class WebSocketTester:
             if not await self.create_discussion(topic, num_agents):
                 return False
 
-            # Connect WebSocket
-            if not await self.connect_websocket():
+            # Connect WebSocket and receive messages; the connection is
+            # closed when the block exits
+            try:
+                async with self.connect_websocket() as self.websocket:
+                    console.print("[green]✓ WebSocket connected[/green]")
+                    await self.receive_messages()
+            except (OSError, websockets.WebSocketException) as e:
+                console.print(f"[red]✗ WebSocket connection failed: {e}[/red]")
                 return False
-
-            # Start ping task
-            ping_task = asyncio.create_task(self.send_ping())
-
-            # Receive messages
-            await self.receive_messages()
-
-            # Cancel ping task
-            ping_task.cancel()
-
-            # Close connection
-            await self.close()
+            console.print("[green]✓ WebSocket closed[/green]")
 
             # Summary
             console.print("\n[bold]Test Summary:[/bold]")
             console.print(f"Discussion ID: {self.discussion_id}")
-            console.print(f"Messages received: {len(self.messages)}")
+            console.print(f"Messages received: {self.message_count}")
             console.print("[green]✓ Test completed successfully[/green]")
 
             return True
@@ -267,19 +323,31 @@ async def test_multiple_clients(discussion_id: str, num_clients: int = 3):
     """Test multiple WebSocket clients connected to same discussion"""
     console.print(f"\n[bold blue]Testing {num_clients} concurrent clients...[/bold blue]")
 
-    clients = []
+    # Resolve the API host once and connect every client to that address
+    ws_url = f"{WS_URL}/ws/discussions/{discussion_id}"
+    parsed = urlsplit(ws_url)
+    addrinfo = await asyncio.get_running_loop().getaddrinfo(
+        parsed.hostname, parsed.port or 80, type=socket.SOCK_STREAM
+    )
+    host, port = addrinfo[0][4][:2]
 
     async def client_listener(client_id: int):
         """Listen for messages on a client"""
-        ws_url = f"{WS_URL}/ws/discussions/{discussion_id}"
-        async with websockets.connect(ws_url) as websocket:
+        async with websockets.connect(
+            ws_url,
+            host=host,
+            port=port,
+            compression=None,
+            ping_interval=20,
+            ping_timeout=20
+        ) as websocket:
             console.print(f"[green]Client {client_id} connected[/green]")
             message_count = 0
 
             try:
                 async for message in websocket:
                     message_count += 1
-                    data = json.loads(message)
+                    data = json_loads(message)
                     if data.get("type") == "discussion_complete":
                         break
             except Exception as e:
@@ -287,43 +355,52 @@ async def test_multiple_clients(discussion_id: str, num_clients: int = 3):
 
             console.print(f"[cyan]Client {client_id} received {message_count} messages[/cyan]")
 
-    # Create client tasks
-    tasks = [client_listener(i) for i in range(num_clients)]
-
     # Run all clients concurrently
-    await asyncio.gather(*tasks)
+    async with asyncio.TaskGroup() as tg:
+        for i in range(num_clients):
+            tg.create_task(client_listener(i))
 
     console.print("[green]✓ Multi-client test completed[/green]")
 
 
+async def probe_api():
+    """Open and close a TCP connection to the API host"""
+    url = urlsplit(API_URL)
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    writer.close()
+    await writer.wait_closed()
+
+
 async def main():
     """Main test function"""
     console.print("[bold blue]╔════════════════════════════════════╗[/bold blue]")
     console.print("[bold blue]║   CAMEL Discussion API WS Test    ║[/bold blue]")
     console.print("[bold blue]╚════════════════════════════════════╝[/bold blue]")
 
-    # Check if API is running
-    try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
-        if response.status_code == 200:
+    # One pooled async client for all REST calls
+    async with httpx.AsyncClient(
+        base_url=API_URL,
+        timeout=30,
+        http2=importlib.util.find_spec("h2") is not None
+    ) as client:
+        # Check if API is listening (a TCP connect is enough; no request)
+        try:
+            await asyncio.wait_for(probe_api(), timeout=1.0)
             console.print("[green]✓ API is running[/green]")
-        else:
-            console.print("[red]✗ API health check failed[/red]")
+        except (OSError, asyncio.TimeoutError) as e:
+            console.print(f"[red]✗ Cannot connect to API: {e}[/red]")
+            console.print(f"[yellow]Make sure the API is running on {API_URL}[/yellow]")
             return
-    except Exception as e:
-        console.print(f"[red]✗ Cannot connect to API: {e}[/red]")
-        console.print(f"[yellow]Make sure the API is running on {API_URL}[/yellow]")
-        return
-
-    # Get topic from user or use default
-    if len(sys.argv) > 1:
-        topic = " ".join(sys.argv[1:])
-    else:
-        topic = "What are the best strategies for treating chronic migraine?"
 
-    # Run test
-    tester = WebSocketTester()
-    success = await tester.run(topic, num_agents=3)
+        # Get topic from user or use default
+        if len(sys.argv) > 1:
+            topic = " ".join(sys.argv[1:])
+        else:
+            topic = "What are the best strategies for treating chronic migraine?"
+
+        # Run test
+        tester = WebSocketTester(client)
+        success = await tester.run(topic, num_agents=3)
 
     if success:
         console.print("\n[bold green]All tests passed! ✓[/bold green]")
@@ -333,6 +410,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop is optional; fall back to the default asyncio loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -2,7 +2,9 @@
 CAMEL Discussion API - Main Application
 """
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from loguru import logger
 import sys
@@ -40,6 +42,9 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to initialize database: {e}")
         raise
 
+    # Start the background message writer
+    discussions.start_db_writer()
+
     yield
 
     # Shutdown
@@ -52,6 +57,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error closing WebSocket connections: {e}")
 
+    # Write any messages still queued
+    await discussions.stop_db_writer()
+
 
 app = FastAPI(
     title="CAMEL Discussion API",
@@ -60,6 +68,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -72,6 +81,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (message pages); responses that already
+# carry a Content-Encoding are passed through as-is
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Include API routers
 app.include_router(
     discussions.router,
@@ -130,31 +143,30 @@ async def websocket_endpoint(websocket: WebSocket, discussion_id: str):
     await ws_manager.connect(websocket, discussion_id)
 
     try:
-        # Keep connection alive and handle client messages
+        # Keepalive uses protocol-level ping/pong frames (handled by the
+        # server); receiving here is only needed to notice the disconnect
         while True:
             data = await websocket.receive_text()
-
-            # Client can send ping messages to keep connection alive
-            if data == "ping":
-                await websocket.send_json({"type": "pong"})
-            else:
-                # Echo or log other messages
-                logger.debug(f"Received WebSocket message: {data}")
+            logger.debug(f"Received WebSocket message: {data}")
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {discussion_id}")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}", exc_info=True)
+        logger.exception("WebSocket error: {}", e)
     finally:
         await ws_manager.disconnect(websocket, discussion_id)
 
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     uvicorn.run(
         "src.api.main:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        # uvloop ships with uvicorn[standard] except on Windows
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11"
     )
@@ -3,8 +3,9 @@ Discussion API Routes
 Handles all discussion-related HTTP endpoints
 """
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from loguru import logger
 from datetime import datetime
 import asyncio
@@ -14,8 +15,9 @@ from ...database.models import Discussion, Message
 from ...database.session import async_session
 from ..websocket.manager import manager as ws_manager
 from ...utils.config import settings
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from ...utils.clock import now_iso
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 
 router = APIRouter()
@@ -25,6 +27,26 @@ orchestrator = DiscussionOrchestrator(
     consensus_threshold=settings.CAMEL_CONSENSUS_THRESHOLD
 )
 
+# Agent messages sent per WebSocket frame by the background runner
+BROADCAST_BATCH_SIZE = 16
+
+# Built once; SQLAlchemy reuses its compiled form from the statement cache
+_INSERT_MESSAGE = insert(Message)
+
+# Background message writer: rows per transaction, seconds to wait for a
+# batch to fill, and queued rows before callers fall back to saving inline
+DB_WRITE_BATCH_SIZE = 50
+DB_WRITE_INTERVAL = 0.02
+DB_WRITE_QUEUE_SIZE = 1000
+
+_db_write_queue: asyncio.Queue = asyncio.Queue(maxsize=DB_WRITE_QUEUE_SIZE)
+_db_writer_task: Optional[asyncio.Task] = None
+
+# discussion_id -> rows queued but not yet written, and the event set when
+# that count drops to zero (what flush_db_writes waits on)
+_pending_writes: Dict[str, int] = {}
+_writes_done: Dict[str, asyncio.Event] = {}
+
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -38,16 +60,15 @@ class CreateDiscussionRequest(BaseModel):
     user_id: str = Field("default", description="User identifier")
     max_turns: Optional[int] = Field(None, ge=3, le=50, description="Maximum discussion turns")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "topic": "What are the best strategies for treating chronic migraine?",
-                "num_agents": 4,
-                "model_preferences": ["gpt-4", "claude-3-opus"],
-                "user_id": "user123",
-                "max_turns": 20
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "topic": "What are the best strategies for treating chronic migraine?",
+            "num_agents": 4,
+            "model_preferences": ["gpt-4", "claude-3-opus"],
+            "user_id": "user123",
+            "max_turns": 20
         }
+    })
 
 
 class RoleInfo(BaseModel):
@@ -67,24 +88,23 @@ class CreateDiscussionResponse(BaseModel):
     created_at: str
     websocket_url: str
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "discussion_id": "disc_abc123",
-                "topic": "Best strategies for treating chronic migraine",
-                "roles": [
-                    {
-                        "name": "Neurologist",
-                        "expertise": "Brain disorders and neurology",
-                        "perspective": "Clinical evidence-based treatment",
-                        "model": "gpt-4"
-                    }
-                ],
-                "status": "running",
-                "created_at": "2025-10-12T10:00:00Z",
-                "websocket_url": "ws://localhost:8007/ws/discussions/disc_abc123"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "discussion_id": "disc_abc123",
+            "topic": "Best strategies for treating chronic migraine",
+            "roles": [
+                {
+                    "name": "Neurologist",
+                    "expertise": "Brain disorders and neurology",
+                    "perspective": "Clinical evidence-based treatment",
+                    "model": "gpt-4"
+                }
+            ],
+            "status": "running",
+            "created_at": "2025-10-12T10:00:00Z",
+            "websocket_url": "ws://localhost:8007/ws/discussions/disc_abc123"
         }
+    })
 
 
 class SendMessageRequest(BaseModel):
@@ -107,18 +127,6 @@ class DiscussionStatus(BaseModel):
     updated_at: str
 
 
-class MessageResponse(BaseModel):
-    """Single message response"""
-    id: int
-    discussion_id: str
-    role_name: str
-    model: str
-    content: str
-    is_user: bool
-    created_at: str
-    metadata: Optional[Dict[str, Any]]
-
-
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -140,7 +148,7 @@ async def create_discussion(
     The discussion will run automatically until consensus is reached or max_turns exceeded.
     """
     try:
-        logger.info(f"Creating discussion: {request.topic}")
+        logger.info("Creating discussion: {}", request.topic)
 
         # Create discussion through CAMEL orchestrator
         discussion_id = await orchestrator.create_discussion(
@@ -153,19 +161,20 @@ async def create_discussion(
         # Get created discussion details
         discussion = orchestrator.get_discussion(discussion_id)
 
-        # Save to database
-        await save_discussion_to_db(discussion, request.user_id)
+        # Dump the roles once; the same dicts feed the DB row and the response
+        role_dicts = [role.model_dump(mode="json") for role in discussion.roles]
 
-        # Prepare response
-        roles_info = [
-            RoleInfo(
-                name=role.name,
-                expertise=role.expertise,
-                perspective=role.perspective,
-                model=role.model
-            )
-            for role in discussion.roles
-        ]
+        # Prepare response; the dicts come from already-validated roles
+        roles_info = [RoleInfo.model_construct(**d) for d in role_dicts]
+
+        # Save to database after the response is sent, ahead of the runner.
+        # A message posted before this commits inserts the row itself
+        background_tasks.add_task(
+            save_discussion_to_db,
+            discussion,
+            request.user_id,
+            role_dicts
+        )
 
         # Start discussion in background
         background_tasks.add_task(
@@ -174,19 +183,19 @@ async def create_discussion(
             request.max_turns
         )
 
-        logger.info(f"Discussion {discussion_id} created successfully")
+        logger.info("Discussion {} created successfully", discussion_id)
 
         return CreateDiscussionResponse(
             discussion_id=discussion_id,
             topic=request.topic,
             roles=roles_info,
             status="running",
-            created_at=datetime.utcnow().isoformat(),
+            created_at=now_iso(),
             websocket_url=f"ws://localhost:8007/ws/discussions/{discussion_id}"
         )
 
     except Exception as e:
-        logger.error(f"Failed to create discussion: {e}", exc_info=True)
+        logger.exception("Failed to create discussion: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to create discussion: {str(e)}")
 
 
@@ -207,7 +216,11 @@ async def send_message(
     The message will be broadcast to all WebSocket clients.
     """
     try:
-        logger.info(f"User message to {discussion_id}: {request.content[:50]}...")
+        logger.opt(lazy=True).info(
+            "User message to {}: {}...",
+            lambda: discussion_id,
+            lambda: request.content[:50]
+        )
 
         # Verify discussion exists
         discussion = orchestrator.get_discussion(discussion_id)
@@ -225,23 +238,19 @@ async def send_message(
         )
 
         # Broadcast to WebSocket clients
-        await ws_manager.broadcast(discussion_id, {
-            "type": "user_message",
-            "data": {
-                "role_name": "User",
-                "content": request.content,
-                "user_id": request.user_id,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        })
+        await ws_manager.broadcast_user_message(
+            discussion_id,
+            request.content,
+            request.user_id
+        )
 
-        logger.info(f"User message sent to {discussion_id}")
+        logger.info("User message sent to {}", discussion_id)
         return {"status": "sent", "discussion_id": discussion_id}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to send message: {e}", exc_info=True)
+        logger.error("Failed to send message: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -261,7 +270,7 @@ async def get_discussion(discussion_id: str):
         discussion = orchestrator.get_discussion(discussion_id)
         if not discussion:
             # Try database
-            db_discussion = await get_discussion_from_db(discussion_id)
+            db_discussion = await get_discussion_status_from_db(discussion_id)
             if not db_discussion:
                 raise HTTPException(status_code=404, detail="Discussion not found")
 
@@ -273,7 +282,7 @@ async def get_discussion(discussion_id: str):
                 max_turns=20,
                 consensus_reached=bool(db_discussion.consensus_reached),
                 consensus_confidence=None,
-                message_count=len(db_discussion.messages) if db_discussion.messages else 0,
+                message_count=db_discussion.message_count,
                 created_at=db_discussion.created_at.isoformat(),
                 updated_at=db_discussion.updated_at.isoformat()
             )
@@ -287,14 +296,14 @@ async def get_discussion(discussion_id: str):
             consensus_reached=discussion.consensus_reached,
             consensus_confidence=None,  # Not available in in-memory Discussion model
             message_count=len(discussion.messages),
-            created_at=discussion.created_at.isoformat() if discussion.created_at else datetime.utcnow().isoformat(),
-            updated_at=discussion.updated_at.isoformat() if discussion.updated_at else datetime.utcnow().isoformat()
+            created_at=discussion.created_at.isoformat() if discussion.created_at else now_iso(),
+            updated_at=discussion.updated_at.isoformat() if discussion.updated_at else now_iso()
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get discussion {discussion_id}: {e}", exc_info=True)
+        logger.error("Failed to get discussion {}: {}", discussion_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -302,7 +311,9 @@ async def get_discussion(discussion_id: str):
 async def get_messages(
     discussion_id: str,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    after_ts: Optional[datetime] = None,
+    after_id: Optional[int] = None
 ):
     """
     Get discussion messages with pagination
@@ -310,47 +321,68 @@ async def get_messages(
     Query Parameters:
     - limit: Maximum number of messages to return (default: 100)
     - offset: Number of messages to skip (default: 0)
+    - after_ts, after_id: Cursor from a previous page's next_cursor;
+      returns messages after it and ignores offset. Both or neither (422)
 
-    Returns messages in chronological order (oldest first).
+    Returns messages in chronological order (oldest first), plus next_cursor
+    (null on the last page).
     """
     try:
-        logger.info(f"Fetching messages for {discussion_id} (limit={limit}, offset={offset})")
+        logger.info(
+            "Fetching messages for {} (limit={}, offset={}, after_id={})",
+            discussion_id, limit, offset, after_id
+        )
+
+        # Half a cursor would silently fall back to offset paging
+        if (after_ts is None) != (after_id is None):
+            raise HTTPException(
+                status_code=422,
+                detail="after_ts and after_id must be given together"
+            )
 
         messages = await get_messages_from_db(
             discussion_id,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after_ts=after_ts,
+            after_id=after_id
         )
 
         if messages is None:
             raise HTTPException(status_code=404, detail="Discussion not found")
 
+        # Rows go straight to plain dicts and out through orjson, skipping
+        # a per-row pydantic model and FastAPI's jsonable_encoder pass
         message_responses = [
-            MessageResponse(
-                id=msg.id,
-                discussion_id=msg.discussion_id,
-                role_name=msg.role_name,
-                model=msg.model,
-                content=msg.content,
-                is_user=bool(msg.is_user),
-                created_at=msg.created_at.isoformat(),
-                metadata=msg.extra_data  # Renamed from metadata to extra_data in DB model
-            )
+            {
+                "id": msg.id,
+                "discussion_id": msg.discussion_id,
+                "role_name": msg.role_name,
+                "model": msg.model,
+                "content": msg.content,
+                "is_user": bool(msg.is_user),
+                "created_at": msg.created_at.isoformat(),
+                "metadata": msg.extra_data  # Renamed from metadata to extra_data in DB model
+            }
             for msg in messages
         ]
 
-        return {
+        return ORJSONResponse({
             "discussion_id": discussion_id,
             "messages": message_responses,
             "count": len(message_responses),
             "offset": offset,
-            "limit": limit
-        }
+            "limit": limit,
+            "next_cursor": {
+                "after_ts": messages[-1].created_at.isoformat(),
+                "after_id": messages[-1].id
+            } if messages and len(messages) == limit else None
+        })
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get messages: {e}", exc_info=True)
+        logger.error("Failed to get messages: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -367,7 +399,7 @@ async def stop_discussion(discussion_id: str):
     The discussion can be resumed later if needed.
     """
     try:
-        logger.info(f"Stopping discussion {discussion_id}")
+        logger.info("Stopping discussion {}", discussion_id)
 
         # Stop in orchestrator
         success = await orchestrator.stop_discussion(discussion_id)
@@ -378,22 +410,15 @@ async def stop_discussion(discussion_id: str):
         await update_discussion_status(discussion_id, "stopped")
 
         # Notify WebSocket clients
-        await ws_manager.broadcast(discussion_id, {
-            "type": "discussion_stopped",
-            "data": {
-                "discussion_id": discussion_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "message": "Discussion stopped by user"
-            }
-        })
+        await ws_manager.broadcast_discussion_stopped(discussion_id)
 
-        logger.info(f"Discussion {discussion_id} stopped successfully")
+        logger.info("Discussion {} stopped successfully", discussion_id)
         return {"status": "stopped", "discussion_id": discussion_id}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to stop discussion: {e}", exc_info=True)
+        logger.error("Failed to stop discussion: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -405,7 +430,7 @@ async def delete_discussion(discussion_id: str):
     WARNING: This operation cannot be undone!
     """
     try:
-        logger.warning(f"Deleting discussion {discussion_id}")
+        logger.warning("Deleting discussion {}", discussion_id)
 
         # Stop if running
         await orchestrator.stop_discussion(discussion_id)
@@ -416,21 +441,15 @@ async def delete_discussion(discussion_id: str):
             raise HTTPException(status_code=404, detail="Discussion not found")
 
         # Notify WebSocket clients before disconnecting
-        await ws_manager.broadcast(discussion_id, {
-            "type": "discussion_deleted",
-            "data": {
-                "discussion_id": discussion_id,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        })
+        await ws_manager.broadcast_discussion_deleted(discussion_id)
 
-        logger.info(f"Discussion {discussion_id} deleted")
+        logger.info("Discussion {} deleted", discussion_id)
         return {"status": "deleted", "discussion_id": discussion_id}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete discussion: {e}", exc_info=True)
+        logger.error("Failed to delete discussion: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -444,12 +463,12 @@ async def run_discussion_background(discussion_id: str, max_turns: Optional[int]
 
     This function:
     1. Runs the discussion orchestrator
-    2. Saves each message to database
-    3. Broadcasts updates to WebSocket clients
+    2. Queues messages for the background database writer
+    3. Broadcasts them in batches to WebSocket clients
     4. Handles errors gracefully
     """
     try:
-        logger.info(f"Starting background discussion: {discussion_id}")
+        logger.info("Starting background discussion: {}", discussion_id)
 
         # Run discussion and get result
         result = await orchestrator.run_discussion(
@@ -457,32 +476,37 @@ async def run_discussion_background(discussion_id: str, max_turns: Optional[int]
             max_turns=max_turns
         )
 
-        # Broadcast each message as it's generated
-        for message in result.messages:
-            # Save to database
-            await save_message_to_db(
-                discussion_id=discussion_id,
-                role_name=message.role_name,
-                model=message.model,
-                content=message.content,
-                is_user=False,
-                metadata={
-                    "turn": message.turn_number,
-                    "timestamp": message.created_at.isoformat() if message.created_at else None
+        # Broadcast messages in batches, one WebSocket frame per batch; the
+        # database writes happen in the background writer
+        messages = result.messages
+        for start in range(0, len(messages), BROADCAST_BATCH_SIZE):
+            batch = messages[start:start + BROADCAST_BATCH_SIZE]
+
+            await queue_messages_for_db(discussion_id, [
+                {
+                    "role_name": message.role_name,
+                    "model": message.model,
+                    "content": message.content,
+                    "metadata": {
+                        "turn": message.turn_number,
+                        "timestamp": message.created_at.isoformat() if message.created_at else None
+                    }
                 }
-            )
-
-            # Broadcast via WebSocket
-            await ws_manager.broadcast_agent_message(
-                discussion_id=discussion_id,
-                role_name=message.role_name,
-                model=message.model,
-                content=message.content,
-                turn_number=message.turn_number
-            )
+                for message in batch
+            ])
+
+            await ws_manager.broadcast_agent_messages_batch(discussion_id, [
+                {
+                    "role_name": message.role_name,
+                    "model": message.model,
+                    "content": message.content,
+                    "turn_number": message.turn_number
+                }
+                for message in batch
+            ])
 
-            # Small delay to avoid overwhelming clients
-            await asyncio.sleep(0.1)
+        # Every message is stored before the discussion is marked finished
+        await flush_db_writes(discussion_id)
 
         # Update database with final status
         await update_discussion_status(
@@ -500,10 +524,10 @@ async def run_discussion_background(discussion_id: str, max_turns: Optional[int]
             final_summary=result.final_summary
         )
 
-        logger.info(f"Discussion {discussion_id} completed: consensus={result.consensus_reached}")
+        logger.info("Discussion {} completed: consensus={}", discussion_id, result.consensus_reached)
 
     except Exception as e:
-        logger.error(f"Discussion {discussion_id} failed: {e}", exc_info=True)
+        logger.exception("Discussion {} failed: {}", discussion_id, e)
 
         # Update database
         await update_discussion_status(discussion_id, "failed")
@@ -516,25 +540,46 @@ async def run_discussion_background(discussion_id: str, max_turns: Optional[int]
 # DATABASE HELPER FUNCTIONS
 # ============================================================================
 
-async def save_discussion_to_db(discussion, user_id: str):
-    """Save discussion to database"""
+def _insert_discussion(discussion, user_id: str, roles: Optional[List[dict]] = None):
+    """
+    INSERT for a discussion row that does nothing if the row already exists
+
+    Both the background save and the first message write use it, in
+    whichever order they happen to run.
+    """
+    now = datetime.utcnow()
+    return sqlite_insert(Discussion).values(
+        id=discussion.id,
+        topic=discussion.topic,
+        user_id=user_id,
+        status="running",
+        roles=roles if roles is not None else [
+            role.model_dump(mode="json") for role in discussion.roles
+        ],
+        created_at=now,
+        updated_at=now
+    ).on_conflict_do_nothing(index_elements=["id"])
+
+
+async def _ensure_discussion_rows(session, discussion_ids):
+    """Insert the parent rows of in-memory discussions about to get messages"""
+    for discussion_id in discussion_ids:
+        discussion = orchestrator.get_discussion(discussion_id)
+        if discussion is not None:
+            await session.execute(_insert_discussion(discussion, discussion.user_id))
+
+
+async def save_discussion_to_db(discussion, user_id: str, roles: Optional[List[dict]] = None):
+    """Save discussion to database, reusing already-dumped role dicts if given"""
     try:
         async with async_session() as session:
-            db_discussion = Discussion(
-                id=discussion.id,
-                topic=discussion.topic,
-                user_id=user_id,
-                status="running",
-                roles=[role.dict() for role in discussion.roles],
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            session.add(db_discussion)
+            await session.execute(_insert_discussion(discussion, user_id, roles))
             await session.commit()
-            logger.debug(f"Saved discussion {discussion.id} to database")
+            logger.debug("Saved discussion {} to database", discussion.id)
     except Exception as e:
-        logger.error(f"Failed to save discussion to database: {e}", exc_info=True)
-        raise
+        # Runs as a background task: raising would stop Starlette from running
+        # the discussion, and the first message write retries the insert
+        logger.error("Failed to save discussion to database: {}", e)
 
 
 async def save_message_to_db(
@@ -548,55 +593,210 @@ async def save_message_to_db(
     """Save message to database"""
     try:
         async with async_session() as session:
-            message = Message(
-                discussion_id=discussion_id,
-                role_name=role_name,
-                model=model,
-                content=content,
-                is_user=1 if is_user else 0,
-                created_at=datetime.utcnow(),
-                extra_data=metadata  # Renamed from metadata to extra_data in DB model
-            )
-            session.add(message)
+            await _ensure_discussion_rows(session, (discussion_id,))
+            await session.execute(_INSERT_MESSAGE, {
+                "discussion_id": discussion_id,
+                "role_name": role_name,
+                "model": model,
+                "content": content,
+                "is_user": 1 if is_user else 0,
+                "created_at": datetime.utcnow(),
+                "extra_data": metadata  # Renamed from metadata to extra_data in DB model
+            })
+            await session.commit()
+            logger.debug("Saved message from {} to database", role_name)
+    except Exception as e:
+        logger.error("Failed to save message to database: {}", e)
+
+
+def _message_rows(discussion_id: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build Message insert rows from save_message_to_db-style dicts
+
+    Each dict takes the save_message_to_db fields: role_name, model,
+    content, and optionally is_user and metadata.
+    """
+    created_at = datetime.utcnow()
+    return [
+        {
+            "discussion_id": discussion_id,
+            "role_name": message["role_name"],
+            "model": message["model"],
+            "content": message["content"],
+            "is_user": 1 if message.get("is_user") else 0,
+            "created_at": created_at,
+            "extra_data": message.get("metadata")
+        }
+        for message in messages
+    ]
+
+
+async def _insert_message_rows(rows: List[Dict[str, Any]]):
+    """Insert message rows in one transaction"""
+    try:
+        async with async_session() as session:
+            await _ensure_discussion_rows(session, {row["discussion_id"] for row in rows})
+            await session.execute(_INSERT_MESSAGE, rows)
             await session.commit()
-            logger.debug(f"Saved message from {role_name} to database")
+            logger.debug("Saved {} messages to database", len(rows))
     except Exception as e:
-        logger.error(f"Failed to save message to database: {e}", exc_info=True)
+        logger.error("Failed to save messages to database: {}", e)
+
+
+async def _db_writer():
+    """Write queued message rows in batches of up to DB_WRITE_BATCH_SIZE"""
+    loop = asyncio.get_running_loop()
+    while True:
+        rows = [await _db_write_queue.get()]
+
+        # Collect whatever else arrives within the batching window
+        deadline = loop.time() + DB_WRITE_INTERVAL
+        while len(rows) < DB_WRITE_BATCH_SIZE:
+            try:
+                rows.append(await asyncio.wait_for(
+                    _db_write_queue.get(), deadline - loop.time()
+                ))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            await _insert_message_rows(rows)
+        finally:
+            for row in rows:
+                _db_write_queue.task_done()
+                _row_written(row["discussion_id"])
+
+
+def start_db_writer():
+    """Start the background message writer (call on app startup)"""
+    global _db_writer_task
+    if _db_writer_task is None:
+        _db_writer_task = asyncio.create_task(_db_writer())
+
+
+async def stop_db_writer(timeout: float = 10.0):
+    """Flush queued messages and stop the writer (call on app shutdown)"""
+    global _db_writer_task
+    if _db_writer_task is None:
+        return
+
+    try:
+        await asyncio.wait_for(_db_write_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("{} queued messages not saved on shutdown", _db_write_queue.qsize())
+
+    _db_writer_task.cancel()
+    _db_writer_task = None
+
+    # Nothing will write the rest; release anyone still flushing
+    for event in _writes_done.values():
+        event.set()
+    _pending_writes.clear()
+    _writes_done.clear()
+
+
+async def queue_messages_for_db(discussion_id: str, messages: List[Dict[str, Any]]):
+    """
+    Hand messages to the background writer without waiting for the commit
 
+    Saves synchronously if the writer isn't running or its queue is full.
+    """
+    rows = _message_rows(discussion_id, messages)
+
+    if _db_writer_task is None:
+        await _insert_message_rows(rows)
+        return
+
+    for index, row in enumerate(rows):
+        try:
+            _db_write_queue.put_nowait(row)
+            _pending_writes[discussion_id] = _pending_writes.get(discussion_id, 0) + 1
+            _writes_done.setdefault(discussion_id, asyncio.Event())
+        except asyncio.QueueFull:
+            logger.warning("Message write queue full, saving synchronously")
+            await _insert_message_rows(rows[index:])
+            return
+
+
+def _row_written(discussion_id: str):
+    """Count one of a discussion's queued rows as written"""
+    remaining = _pending_writes.get(discussion_id, 0) - 1
+    if remaining > 0:
+        _pending_writes[discussion_id] = remaining
+        return
+
+    _pending_writes.pop(discussion_id, None)
+    event = _writes_done.pop(discussion_id, None)
+    if event is not None:
+        event.set()
 
-async def get_discussion_from_db(discussion_id: str) -> Optional[Discussion]:
-    """Get discussion from database"""
+
+async def flush_db_writes(discussion_id: str):
+    """Wait until every message queued for this discussion has been written"""
+    event = _writes_done.get(discussion_id)
+    if event is not None:
+        await event.wait()
+
+
+async def get_discussion_status_from_db(discussion_id: str):
+    """
+    Get a discussion's status columns and message count in one query
+
+    Returns a row with id, topic, status, consensus_reached, created_at,
+    updated_at and message_count, or None if the discussion doesn't exist.
+    """
     try:
         async with async_session() as session:
             result = await session.execute(
-                select(Discussion)
-                .options(selectinload(Discussion.messages))
+                select(
+                    Discussion.id,
+                    Discussion.topic,
+                    Discussion.status,
+                    Discussion.consensus_reached,
+                    Discussion.created_at,
+                    Discussion.updated_at,
+                    func.count(Message.id).label("message_count")
+                )
+                .outerjoin(Message, Message.discussion_id == Discussion.id)
                 .where(Discussion.id == discussion_id)
+                .group_by(Discussion.id)
             )
-            return result.scalar_one_or_none()
+            return result.one_or_none()
     except Exception as e:
-        logger.error(f"Failed to get discussion from database: {e}", exc_info=True)
+        logger.error("Failed to get discussion from database: {}", e)
         return None
 
 
 async def get_messages_from_db(
     discussion_id: str,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    after_ts: Optional[datetime] = None,
+    after_id: Optional[int] = None
 ) -> Optional[List[Message]]:
-    """Get messages from database with pagination"""
+    """
+    Get messages from database with pagination
+
+    With a (after_ts, after_id) cursor this seeks past the last message
+    seen (keyset pagination); otherwise it falls back to offset.
+    """
+    query = (
+        select(Message)
+        .where(Message.discussion_id == discussion_id)
+        .order_by(Message.created_at.asc(), Message.id.asc())
+        .limit(limit)
+    )
+    if after_ts is not None and after_id is not None:
+        query = query.where(tuple_(Message.created_at, Message.id) > (after_ts, after_id))
+    else:
+        query = query.offset(offset)
+
     try:
         async with async_session() as session:
-            result = await session.execute(
-                select(Message)
-                .where(Message.discussion_id == discussion_id)
-                .order_by(Message.created_at.asc())
-                .limit(limit)
-                .offset(offset)
-            )
+            result = await session.execute(query)
             return result.scalars().all()
     except Exception as e:
-        logger.error(f"Failed to get messages from database: {e}", exc_info=True)
+        logger.error("Failed to get messages from database: {}", e)
         return None
 
 
@@ -607,37 +807,33 @@ async def update_discussion_status(
     consensus_summary: Optional[str] = None
 ):
     """Update discussion status in database"""
+    values = {"status": status, "updated_at": datetime.utcnow()}
+    if consensus_reached:
+        values["consensus_reached"] = 1
+    if consensus_summary:
+        values["consensus_summary"] = consensus_summary
+
     try:
         async with async_session() as session:
+            # One UPDATE; no need to load the row first
             result = await session.execute(
-                select(Discussion).where(Discussion.id == discussion_id)
+                update(Discussion)
+                .where(Discussion.id == discussion_id)
+                .values(**values)
             )
-            discussion = result.scalar_one_or_none()
-
-            if discussion:
-                discussion.status = status
-                discussion.updated_at = datetime.utcnow()
-                if consensus_reached:
-                    discussion.consensus_reached = 1
-                if consensus_summary:
-                    discussion.consensus_summary = consensus_summary
-
-                await session.commit()
-                logger.debug(f"Updated discussion {discussion_id} status to {status}")
+            await session.commit()
+
+            if result.rowcount:
+                logger.debug("Updated discussion {} status to {}", discussion_id, status)
     except Exception as e:
-        logger.error(f"Failed to update discussion status: {e}", exc_info=True)
+        logger.error("Failed to update discussion status: {}", e)
 
 
 async def delete_discussion_from_db(discussion_id: str) -> bool:
     """Delete discussion and all messages from database"""
     try:
         async with async_session() as session:
-            # Delete messages first (foreign key constraint)
-            await session.execute(
-                Message.__table__.delete().where(Message.discussion_id == discussion_id)
-            )
-
-            # Delete discussion
+            # Messages and metrics go with it via ON DELETE CASCADE
             result = await session.execute(
                 Discussion.__table__.delete().where(Discussion.id == discussion_id)
             )
@@ -645,5 +841,5 @@ async def delete_discussion_from_db(discussion_id: str) -> bool:
             await session.commit()
             return result.rowcount > 0
     except Exception as e:
-        logger.error(f"Failed to delete discussion from database: {e}", exc_info=True)
+        logger.error("Failed to delete discussion from database: {}", e)
         return False
@@ -2,10 +2,13 @@
 Models API Routes
 Handles model-related endpoints (listing available LLMs, model info)
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List, Dict, Any
 from pydantic import BaseModel
 from loguru import logger
+import gzip
+import hashlib
+import json
 
 from ...camel_engine.llm_provider import OpenRouterClient
 from ...utils.config import settings
@@ -35,12 +38,212 @@ class ModelsListResponse(BaseModel):
     count: int
 
 
+# ============================================================================
+# MODEL CATALOG
+# ============================================================================
+
+# Predefined list of supported models
+# In production, this could be fetched from OpenRouter API
+SUPPORTED_MODELS: List[ModelInfo] = [
+    ModelInfo(
+        id="openai/gpt-4",
+        name="GPT-4",
+        provider="OpenAI",
+        context_length=8192,
+        pricing={"prompt": "0.03", "completion": "0.06"},
+        capabilities=["chat", "reasoning", "structured_output"]
+    ),
+    ModelInfo(
+        id="openai/gpt-4-turbo",
+        name="GPT-4 Turbo",
+        provider="OpenAI",
+        context_length=128000,
+        pricing={"prompt": "0.01", "completion": "0.03"},
+        capabilities=["chat", "reasoning", "structured_output", "vision"]
+    ),
+    ModelInfo(
+        id="openai/gpt-3.5-turbo",
+        name="GPT-3.5 Turbo",
+        provider="OpenAI",
+        context_length=16385,
+        pricing={"prompt": "0.0005", "completion": "0.0015"},
+        capabilities=["chat", "reasoning", "fast"]
+    ),
+    ModelInfo(
+        id="anthropic/claude-3-opus",
+        name="Claude 3 Opus",
+        provider="Anthropic",
+        context_length=200000,
+        pricing={"prompt": "0.015", "completion": "0.075"},
+        capabilities=["chat", "reasoning", "structured_output", "long_context"]
+    ),
+    ModelInfo(
+        id="anthropic/claude-3-sonnet",
+        name="Claude 3 Sonnet",
+        provider="Anthropic",
+        context_length=200000,
+        pricing={"prompt": "0.003", "completion": "0.015"},
+        capabilities=["chat", "reasoning", "structured_output", "long_context"]
+    ),
+    ModelInfo(
+        id="anthropic/claude-3-haiku",
+        name="Claude 3 Haiku",
+        provider="Anthropic",
+        context_length=200000,
+        pricing={"prompt": "0.00025", "completion": "0.00125"},
+        capabilities=["chat", "reasoning", "fast"]
+    ),
+    ModelInfo(
+        id="google/gemini-pro-1.5",
+        name="Gemini 1.5 Pro",
+        provider="Google",
+        context_length=1000000,
+        pricing={"prompt": "0.0025", "completion": "0.0075"},
+        capabilities=["chat", "reasoning", "vision", "long_context"]
+    ),
+    ModelInfo(
+        id="google/gemini-flash-1.5",
+        name="Gemini 1.5 Flash",
+        provider="Google",
+        context_length=1000000,
+        pricing={"prompt": "0.000075", "completion": "0.0003"},
+        capabilities=["chat", "reasoning", "fast", "long_context"]
+    ),
+    ModelInfo(
+        id="meta-llama/llama-3-70b-instruct",
+        name="Llama 3 70B Instruct",
+        provider="Meta",
+        context_length=8192,
+        pricing={"prompt": "0.00059", "completion": "0.00079"},
+        capabilities=["chat", "reasoning", "open_source"]
+    ),
+    ModelInfo(
+        id="mistralai/mistral-large",
+        name="Mistral Large",
+        provider="Mistral AI",
+        context_length=32000,
+        pricing={"prompt": "0.004", "completion": "0.012"},
+        capabilities=["chat", "reasoning", "multilingual"]
+    )
+]
+
+# The catalog is static, so every derived view is built once at import
+
+def _etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _precompressed(body: bytes) -> Dict[str, Any]:
+    """Identity and gzip variants of a static body, each with its own ETag"""
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    return {
+        "body": body,
+        "etag": _etag(body),
+        "gzip_body": gzipped,
+        "gzip_etag": _etag(gzipped)
+    }
+
+
+_MODELS_RESPONSE = ModelsListResponse(models=SUPPORTED_MODELS, count=len(SUPPORTED_MODELS))
+_MODELS_JSON = _precompressed(_MODELS_RESPONSE.model_dump_json().encode())
+_MODEL_BY_ID: Dict[str, ModelInfo] = {model.id: model for model in SUPPORTED_MODELS}
+
+
+def _group_by_provider(models: List[ModelInfo]) -> Dict[str, Any]:
+    """Build the providers listing for a model catalog"""
+    providers: Dict[str, Dict[str, Any]] = {}
+    for model in models:
+        provider = providers.setdefault(
+            model.provider,
+            {"name": model.provider, "models": [], "count": 0}
+        )
+        provider["models"].append({"id": model.id, "name": model.name})
+        provider["count"] += 1
+
+    return {
+        "providers": list(providers.values()),
+        "total_providers": len(providers)
+    }
+
+
+_PROVIDERS_JSON = _precompressed(json.dumps(_group_by_provider(SUPPORTED_MODELS)).encode())
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (honouring q-values and *)"""
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag
+
+    Handles lists of tags and * and compares weakly (W/ ignored), as
+    RFC 9110 specifies for If-None-Match.
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _cached_json(request: Request, cached: Dict[str, Any]) -> Response:
+    """
+    Serve pre-encoded JSON, or 304 if the client already has this version
+
+    Clients accepting gzip get the body compressed at import; the
+    Content-Encoding header makes GZipMiddleware pass it through untouched.
+    """
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    if use_gzip:
+        body, etag = cached["gzip_body"], cached["gzip_etag"]
+    else:
+        body, etag = cached["body"], cached["etag"]
+
+    # Vary goes on every response, 304s included, so caches key on encoding
+    headers = {
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+        "ETag": etag
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
 
 @router.get("/", response_model=ModelsListResponse)
-async def list_models():
+async def list_models(request: Request):
     """
     List all available LLM models
 
@@ -53,103 +256,10 @@ async def list_models():
 
     This helps users choose appropriate models for their discussions.
     """
-    try:
-        logger.info("Fetching available models")
-
-        # Predefined list of supported models
-        # In production, this could be fetched from OpenRouter API
-        models = [
-            ModelInfo(
-                id="openai/gpt-4",
-                name="GPT-4",
-                provider="OpenAI",
-                context_length=8192,
-                pricing={"prompt": "0.03", "completion": "0.06"},
-                capabilities=["chat", "reasoning", "structured_output"]
-            ),
-            ModelInfo(
-                id="openai/gpt-4-turbo",
-                name="GPT-4 Turbo",
-                provider="OpenAI",
-                context_length=128000,
-                pricing={"prompt": "0.01", "completion": "0.03"},
-                capabilities=["chat", "reasoning", "structured_output", "vision"]
-            ),
-            ModelInfo(
-                id="openai/gpt-3.5-turbo",
-                name="GPT-3.5 Turbo",
-                provider="OpenAI",
-                context_length=16385,
-                pricing={"prompt": "0.0005", "completion": "0.0015"},
-                capabilities=["chat", "reasoning", "fast"]
-            ),
-            ModelInfo(
-                id="anthropic/claude-3-opus",
-                name="Claude 3 Opus",
-                provider="Anthropic",
-                context_length=200000,
-                pricing={"prompt": "0.015", "completion": "0.075"},
-                capabilities=["chat", "reasoning", "structured_output", "long_context"]
-            ),
-            ModelInfo(
-                id="anthropic/claude-3-sonnet",
-                name="Claude 3 Sonnet",
-                provider="Anthropic",
-                context_length=200000,
-                pricing={"prompt": "0.003", "completion": "0.015"},
-                capabilities=["chat", "reasoning", "structured_output", "long_context"]
-            ),
-            ModelInfo(
-                id="anthropic/claude-3-haiku",
-                name="Claude 3 Haiku",
-                provider="Anthropic",
-                context_length=200000,
-                pricing={"prompt": "0.00025", "completion": "0.00125"},
-                capabilities=["chat", "reasoning", "fast"]
-            ),
-            ModelInfo(
-                id="google/gemini-pro-1.5",
-                name="Gemini 1.5 Pro",
-                provider="Google",
-                context_length=1000000,
-                pricing={"prompt": "0.0025", "completion": "0.0075"},
-                capabilities=["chat", "reasoning", "vision", "long_context"]
-            ),
-            ModelInfo(
-                id="google/gemini-flash-1.5",
-                name="Gemini 1.5 Flash",
-                provider="Google",
-                context_length=1000000,
-                pricing={"prompt": "0.000075", "completion": "0.0003"},
-                capabilities=["chat", "reasoning", "fast", "long_context"]
-            ),
-            ModelInfo(
-                id="meta-llama/llama-3-70b-instruct",
-                name="Llama 3 70B Instruct",
-                provider="Meta",
-                context_length=8192,
-                pricing={"prompt": "0.00059", "completion": "0.00079"},
-                capabilities=["chat", "reasoning", "open_source"]
-            ),
-            ModelInfo(
-                id="mistralai/mistral-large",
-                name="Mistral Large",
-                provider="Mistral AI",
-                context_length=32000,
-                pricing={"prompt": "0.004", "completion": "0.012"},
-                capabilities=["chat", "reasoning", "multilingual"]
-            )
-        ]
-
-        logger.info(f"Returning {len(models)} available models")
-        return ModelsListResponse(
-            models=models,
-            count=len(models)
-        )
+    logger.info("Fetching available models")
 
-    except Exception as e:
-        logger.error(f"Failed to list models: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to list models: {str(e)}")
+    # Pre-encoded at import; returned as-is to skip per-request serialization
+    return _cached_json(request, _MODELS_JSON)
 
 
 @router.get("/{model_id}", response_model=ModelInfo)
@@ -165,9 +275,7 @@ async def get_model_info(model_id: str):
     try:
         logger.info(f"Getting info for model: {model_id}")
 
-        # Get all models and find the requested one
-        models_response = await list_models()
-        model = next((m for m in models_response.models if m.id == model_id), None)
+        model = _MODEL_BY_ID.get(model_id)
 
         if not model:
             raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
@@ -177,7 +285,7 @@ async def get_model_info(model_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get model info: {e}", exc_info=True)
+        logger.error("Failed to get model info: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -207,7 +315,7 @@ async def normalize_model_name(model_preference: str):
         }
 
     except Exception as e:
-        logger.error(f"Failed to normalize model name: {e}", exc_info=True)
+        logger.error("Failed to normalize model name: {}", e)
         return {
             "input": model_preference,
             "normalized": model_preference,
@@ -217,43 +325,15 @@ async def normalize_model_name(model_preference: str):
 
 
 @router.get("/providers/list")
-async def list_providers():
+async def list_providers(request: Request):
     """
     List all available LLM providers
 
     Returns a list of providers with their available models.
     Useful for filtering models by provider.
     """
-    try:
-        logger.info("Listing providers")
-
-        # Get all models
-        models_response = await list_models()
-
-        # Group by provider
-        providers = {}
-        for model in models_response.models:
-            if model.provider not in providers:
-                providers[model.provider] = {
-                    "name": model.provider,
-                    "models": [],
-                    "count": 0
-                }
-
-            providers[model.provider]["models"].append({
-                "id": model.id,
-                "name": model.name
-            })
-            providers[model.provider]["count"] += 1
-
-        return {
-            "providers": list(providers.values()),
-            "total_providers": len(providers)
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to list providers: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info("Listing providers")
+    return _cached_json(request, _PROVIDERS_JSON)
 
 
 @router.post("/test")
@@ -292,5 +372,5 @@ async def test_model(model_id: str, prompt: str = "Hello, how are you?"):
         }
 
     except Exception as e:
-        logger.error(f"Model test failed: {e}", exc_info=True)
+        logger.error("Model test failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Model test failed: {str(e)}")
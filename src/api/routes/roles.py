@@ -2,9 +2,10 @@
 Roles API Routes
 Handles role-related endpoints (previewing roles, role templates)
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from loguru import logger
 
 from ...camel_engine.role_creator import RoleCreator, RoleDefinition
@@ -27,29 +28,19 @@ class PreviewRolesRequest(BaseModel):
     num_roles: int = Field(4, ge=2, le=8, description="Number of roles to create")
     model_preferences: Optional[List[str]] = Field(None, description="Preferred models for agents")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "topic": "What are the best strategies for treating chronic migraine?",
-                "num_roles": 4,
-                "model_preferences": ["gpt-4", "claude-3-opus"]
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "topic": "What are the best strategies for treating chronic migraine?",
+            "num_roles": 4,
+            "model_preferences": ["gpt-4", "claude-3-opus"]
         }
-
-
-class RoleResponse(BaseModel):
-    """Single role response"""
-    name: str
-    expertise: str
-    perspective: str
-    model: str
-    system_prompt: str
+    })
 
 
 class PreviewRolesResponse(BaseModel):
     """Response for role preview"""
     topic: str
-    roles: List[RoleResponse]
+    roles: List[RoleDefinition]
     topic_analysis: Dict[str, Any]
 
 
@@ -67,12 +58,135 @@ class AnalyzeTopicRequest(BaseModel):
     """Request to analyze a topic"""
     topic: str = Field(..., min_length=10, max_length=500, description="Topic to analyze")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "topic": "What are the implications of artificial intelligence in healthcare?"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "topic": "What are the implications of artificial intelligence in healthcare?"
         }
+    })
+
+
+# ============================================================================
+# ROLE TEMPLATE CATALOG
+# ============================================================================
+
+# Common role archetypes; general-purpose roles that adapt to specific topics
+ROLE_TEMPLATES: List[RoleTemplate] = [
+    RoleTemplate(
+        id="researcher",
+        name="Research Scientist",
+        expertise="Evidence-based analysis and empirical research",
+        perspective="Academic rigor, peer-reviewed studies, systematic reviews",
+        applicable_topics=["medical", "scientific", "technical"],
+        example_use_cases=[
+            "Medical treatment discussions",
+            "Climate change debates",
+            "Technology assessments"
+        ]
+    ),
+    RoleTemplate(
+        id="practitioner",
+        name="Practitioner",
+        expertise="Real-world application and practical experience",
+        perspective="Hands-on experience, pragmatic solutions, field expertise",
+        applicable_topics=["medical", "business", "engineering"],
+        example_use_cases=[
+            "Clinical medicine",
+            "Software development",
+            "Business operations"
+        ]
+    ),
+    RoleTemplate(
+        id="policy_expert",
+        name="Policy Expert",
+        expertise="Regulatory frameworks and policy implications",
+        perspective="Legal compliance, ethical considerations, stakeholder impact",
+        applicable_topics=["policy", "legal", "ethics"],
+        example_use_cases=[
+            "Healthcare policy",
+            "Data privacy",
+            "Environmental regulation"
+        ]
+    ),
+    RoleTemplate(
+        id="economist",
+        name="Economist",
+        expertise="Economic analysis and cost-benefit evaluation",
+        perspective="Financial feasibility, market dynamics, resource allocation",
+        applicable_topics=["business", "policy", "healthcare"],
+        example_use_cases=[
+            "Healthcare costs",
+            "Business strategy",
+            "Public policy"
+        ]
+    ),
+    RoleTemplate(
+        id="user_advocate",
+        name="User/Patient Advocate",
+        expertise="End-user perspective and lived experience",
+        perspective="Quality of life, accessibility, user experience",
+        applicable_topics=["healthcare", "product design", "social services"],
+        example_use_cases=[
+            "Medical treatments",
+            "Product features",
+            "Social programs"
+        ]
+    ),
+    RoleTemplate(
+        id="systems_thinker",
+        name="Systems Thinker",
+        expertise="Holistic analysis and interconnected systems",
+        perspective="Long-term effects, unintended consequences, systemic change",
+        applicable_topics=["complex systems", "policy", "organizational"],
+        example_use_cases=[
+            "Healthcare reform",
+            "Climate action",
+            "Organizational change"
+        ]
+    ),
+    RoleTemplate(
+        id="data_analyst",
+        name="Data Analyst",
+        expertise="Statistical analysis and data-driven insights",
+        perspective="Quantitative evidence, trends, predictive models",
+        applicable_topics=["business", "scientific", "technical"],
+        example_use_cases=[
+            "Market analysis",
+            "Clinical trials",
+            "Performance optimization"
+        ]
+    ),
+    RoleTemplate(
+        id="ethicist",
+        name="Ethicist",
+        expertise="Ethical principles and moral reasoning",
+        perspective="Rights, justice, fairness, ethical implications",
+        applicable_topics=["medical", "policy", "AI/technology"],
+        example_use_cases=[
+            "Medical ethics",
+            "AI governance",
+            "Research ethics"
+        ]
+    )
+]
+
+# The catalog is static, so responses are encoded once at import
+_TEMPLATES_JSON = TypeAdapter(List[RoleTemplate]).dump_json(ROLE_TEMPLATES)
+_TEMPLATE_JSON_BY_ID: Dict[str, bytes] = {
+    template.id: template.model_dump_json().encode() for template in ROLE_TEMPLATES
+}
+
+
+def _index_by_domain(templates: List[RoleTemplate]) -> Dict[str, List[Dict[str, Any]]]:
+    """Map each lowercased applicable topic to its templates, in catalog order"""
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for template in templates:
+        template_dict = template.model_dump()
+        for topic in {topic.lower() for topic in template.applicable_topics}:
+            index.setdefault(topic, []).append(template_dict)
+    return index
+
+
+_DOMAIN_INDEX = _index_by_domain(ROLE_TEMPLATES)
 
 
 # ============================================================================
@@ -93,45 +207,47 @@ async def preview_roles(request: PreviewRolesRequest):
     The actual discussion creation happens via /api/discussions/create
     """
     try:
-        logger.info(f"Previewing roles for topic: {request.topic}")
+        logger.info("Previewing roles for topic: {}", request.topic)
 
         # Analyze topic first
         analysis = await role_creator.analyze_topic(request.topic)
 
-        # Create roles
+        # Create roles; role generation builds on the analysis, so the two
+        # calls can't overlap, but the analysis is only done once
         roles = await role_creator.create_roles(
             topic=request.topic,
             num_roles=request.num_roles,
-            model_preferences=request.model_preferences
+            model_preferences=request.model_preferences,
+            analysis=analysis
         )
 
-        # Convert to response format
-        role_responses = [
-            RoleResponse(
-                name=role.name,
-                expertise=role.expertise,
-                perspective=role.perspective,
-                model=role.model,
-                system_prompt=role.system_prompt
-            )
-            for role in roles
-        ]
-
-        logger.info(f"Generated {len(roles)} roles for preview")
+        logger.info("Generated {} roles for preview", len(roles))
 
-        return PreviewRolesResponse(
-            topic=request.topic,
-            roles=role_responses,
-            topic_analysis={
-                "domain": analysis.domain,
+        # The roles were validated when they were created, so build the
+        # PreviewRolesResponse shape directly; returning a Response skips
+        # FastAPI's response_model re-validation (kept for the docs)
+        return ORJSONResponse({
+            "topic": request.topic,
+            "roles": [
+                {
+                    "name": role.name,
+                    "expertise": role.expertise,
+                    "perspective": role.perspective,
+                    "model": role.model,
+                    "system_prompt": role.system_prompt
+                }
+                for role in roles
+            ],
+            "topic_analysis": {
+                "domain": analysis.primary_domain,
                 "complexity": analysis.complexity,
                 "key_aspects": analysis.key_aspects,
-                "recommended_expertise": analysis.recommended_expertise
+                "recommended_expertise": analysis.recommended_expert_types
             }
-        )
+        })
 
     except Exception as e:
-        logger.error(f"Failed to preview roles: {e}", exc_info=True)
+        logger.error("Failed to preview roles: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to preview roles: {str(e)}")
 
 
@@ -144,114 +260,10 @@ async def get_role_templates():
     different discussions. These are general-purpose roles that adapt
     to specific topics.
     """
-    try:
-        logger.info("Fetching role templates")
-
-        templates = [
-            RoleTemplate(
-                id="researcher",
-                name="Research Scientist",
-                expertise="Evidence-based analysis and empirical research",
-                perspective="Academic rigor, peer-reviewed studies, systematic reviews",
-                applicable_topics=["medical", "scientific", "technical"],
-                example_use_cases=[
-                    "Medical treatment discussions",
-                    "Climate change debates",
-                    "Technology assessments"
-                ]
-            ),
-            RoleTemplate(
-                id="practitioner",
-                name="Practitioner",
-                expertise="Real-world application and practical experience",
-                perspective="Hands-on experience, pragmatic solutions, field expertise",
-                applicable_topics=["medical", "business", "engineering"],
-                example_use_cases=[
-                    "Clinical medicine",
-                    "Software development",
-                    "Business operations"
-                ]
-            ),
-            RoleTemplate(
-                id="policy_expert",
-                name="Policy Expert",
-                expertise="Regulatory frameworks and policy implications",
-                perspective="Legal compliance, ethical considerations, stakeholder impact",
-                applicable_topics=["policy", "legal", "ethics"],
-                example_use_cases=[
-                    "Healthcare policy",
-                    "Data privacy",
-                    "Environmental regulation"
-                ]
-            ),
-            RoleTemplate(
-                id="economist",
-                name="Economist",
-                expertise="Economic analysis and cost-benefit evaluation",
-                perspective="Financial feasibility, market dynamics, resource allocation",
-                applicable_topics=["business", "policy", "healthcare"],
-                example_use_cases=[
-                    "Healthcare costs",
-                    "Business strategy",
-                    "Public policy"
-                ]
-            ),
-            RoleTemplate(
-                id="user_advocate",
-                name="User/Patient Advocate",
-                expertise="End-user perspective and lived experience",
-                perspective="Quality of life, accessibility, user experience",
-                applicable_topics=["healthcare", "product design", "social services"],
-                example_use_cases=[
-                    "Medical treatments",
-                    "Product features",
-                    "Social programs"
-                ]
-            ),
-            RoleTemplate(
-                id="systems_thinker",
-                name="Systems Thinker",
-                expertise="Holistic analysis and interconnected systems",
-                perspective="Long-term effects, unintended consequences, systemic change",
-                applicable_topics=["complex systems", "policy", "organizational"],
-                example_use_cases=[
-                    "Healthcare reform",
-                    "Climate action",
-                    "Organizational change"
-                ]
-            ),
-            RoleTemplate(
-                id="data_analyst",
-                name="Data Analyst",
-                expertise="Statistical analysis and data-driven insights",
-                perspective="Quantitative evidence, trends, predictive models",
-                applicable_topics=["business", "scientific", "technical"],
-                example_use_cases=[
-                    "Market analysis",
-                    "Clinical trials",
-                    "Performance optimization"
-                ]
-            ),
-            RoleTemplate(
-                id="ethicist",
-                name="Ethicist",
-                expertise="Ethical principles and moral reasoning",
-                perspective="Rights, justice, fairness, ethical implications",
-                applicable_topics=["medical", "policy", "AI/technology"],
-                example_use_cases=[
-                    "Medical ethics",
-                    "AI governance",
-                    "Research ethics"
-                ]
-            )
-        ]
+    logger.info("Fetching role templates")
 
-        logger.info(f"Returning {len(templates)} role templates")
-        return templates
-
-    except Exception as e:
-        logger.error(f"Failed to get role templates: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+    # Pre-encoded at import; returned as-is to skip per-request validation
+    return Response(content=_TEMPLATES_JSON, media_type="application/json")
 
 
 @router.get("/templates/{template_id}", response_model=RoleTemplate)
@@ -265,20 +277,19 @@ async def get_role_template(template_id: str):
     Returns detailed information about the role template.
     """
     try:
-        logger.info(f"Fetching role template: {template_id}")
+        logger.info("Fetching role template: {}", template_id)
 
-        templates = await get_role_templates()
-        template = next((t for t in templates if t.id == template_id), None)
+        template = _TEMPLATE_JSON_BY_ID.get(template_id)
 
         if not template:
             raise HTTPException(status_code=404, detail=f"Template {template_id} not found")
 
-        return template
+        return Response(content=template, media_type="application/json")
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get role template: {e}", exc_info=True)
+        logger.error("Failed to get role template: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -299,21 +310,21 @@ async def analyze_topic(request: AnalyzeTopicRequest):
     This helps understand what types of roles would be most appropriate.
     """
     try:
-        logger.info(f"Analyzing topic: {request.topic}")
+        logger.info("Analyzing topic: {}", request.topic)
 
         analysis = await role_creator.analyze_topic(request.topic)
 
         return {
             "topic": request.topic,
-            "domain": analysis.domain,
+            "domain": analysis.primary_domain,
             "complexity": analysis.complexity,
             "key_aspects": analysis.key_aspects,
-            "recommended_expertise": analysis.recommended_expertise,
-            "suggested_num_roles": 4 if analysis.complexity in ["simple", "moderate"] else 6
+            "recommended_expertise": analysis.recommended_expert_types,
+            "suggested_num_roles": 4 if analysis.complexity <= 3 else 6
         }
 
     except Exception as e:
-        logger.error(f"Failed to analyze topic: {e}", exc_info=True)
+        logger.error("Failed to analyze topic: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -328,18 +339,12 @@ async def get_roles_by_domain(domain: str):
     Returns role templates that are most applicable to the specified domain.
     """
     try:
-        logger.info(f"Getting roles for domain: {domain}")
+        logger.info("Getting roles for domain: {}", domain)
 
-        templates = await get_role_templates()
-
-        # Filter templates by domain
-        filtered_templates = [
-            t for t in templates
-            if domain.lower() in [topic.lower() for topic in t.applicable_topics]
-        ]
+        filtered_templates = _DOMAIN_INDEX.get(domain.lower(), [])
 
         if not filtered_templates:
-            logger.warning(f"No templates found for domain: {domain}")
+            logger.warning("No templates found for domain: {}", domain)
             return {
                 "domain": domain,
                 "roles": [],
@@ -353,5 +358,5 @@ async def get_roles_by_domain(domain: str):
         }
 
     except Exception as e:
-        logger.error(f"Failed to get roles by domain: {e}", exc_info=True)
+        logger.error("Failed to get roles by domain: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
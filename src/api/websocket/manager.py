@@ -2,11 +2,77 @@
 WebSocket Connection Manager
 Manages real-time WebSocket connections for discussion updates
 """
+import asyncio
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, Set, Any
+from typing import Dict, List, Any
 from loguru import logger
 import json
-from datetime import datetime
+
+from ...utils.clock import now_iso
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a message to UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+async def send_json_fast(websocket: WebSocket, obj: Any):
+    """
+    Send a JSON message as a single binary frame
+
+    Args:
+        websocket: Target WebSocket
+        obj: JSON-serializable message
+    """
+    await websocket.send_bytes(_dumps(obj))
+
+
+# Frames buffered per client before it is dropped as too slow
+SEND_QUEUE_SIZE = 256
+
+# Pre-serialized envelopes for the fixed-shape events. Each %s slot takes a
+# JSON-encoded value and the last one is always the top-level timestamp, so
+# the frames match what broadcast() would produce from the equivalent dict
+_AGENT_MESSAGE_FRAME = (
+    b'{"type":"agent_message","data":{"role_name":%s,"model":%s,"content":%s,'
+    b'"turn_number":%s},"timestamp":%s}'
+)
+_AGENT_MESSAGES_BATCH_FRAME = b'{"type":"agent_messages_batch","data":%s,"timestamp":%s}'
+_CONSENSUS_UPDATE_FRAME = (
+    b'{"type":"consensus_update","data":{"reached":%s,"confidence":%s,"summary":%s,'
+    b'"agreements":%s,"disagreements":%s},"timestamp":%s}'
+)
+_DISCUSSION_COMPLETE_FRAME = (
+    b'{"type":"discussion_complete","data":{"total_turns":%s,"consensus_reached":%s,'
+    b'"final_summary":%s,"status":"completed"},"timestamp":%s}'
+)
+_ERROR_FRAME = b'{"type":"error","error":%s,"timestamp":%s}'
+_STOPPED_FRAME = (
+    b'{"type":"discussion_stopped","data":{"discussion_id":%s,"timestamp":%s,'
+    b'"message":"Discussion stopped by user"},"timestamp":%s}'
+)
+_DELETED_FRAME = (
+    b'{"type":"discussion_deleted","data":{"discussion_id":%s,"timestamp":%s},'
+    b'"timestamp":%s}'
+)
+_USER_MESSAGE_FRAME = (
+    b'{"type":"user_message","data":{"role_name":"User","content":%s,'
+    b'"user_id":%s,"timestamp":%s},"timestamp":%s}'
+)
+
+
+def _drain(queue: asyncio.Queue):
+    """Discard queued frames, marking them done so flush() can return"""
+    while not queue.empty():
+        queue.get_nowait()
+        queue.task_done()
 
 
 class ConnectionManager:
@@ -15,19 +81,25 @@ class ConnectionManager:
 
     Features:
     - Multiple clients per discussion
-    - Broadcast to all clients in a discussion
+    - Broadcast to all clients in a discussion (queued per client, so a
+      slow client can't hold up the others)
     - Personal messages to specific clients
     - Automatic cleanup of dead connections
     - Graceful disconnection handling
     """
 
     def __init__(self):
-        # discussion_id -> Set of WebSocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # discussion_id -> WebSocket connections (a list: a discussion has
+        # few clients, and broadcasts only iterate)
+        self.active_connections: Dict[str, List[WebSocket]] = {}
 
         # WebSocket -> discussion_id mapping (for reverse lookup)
         self.connection_mapping: Dict[WebSocket, str] = {}
 
+        # WebSocket -> outgoing frame queue and the task draining it
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.sender_tasks: Dict[WebSocket, asyncio.Task] = {}
+
     async def connect(self, websocket: WebSocket, discussion_id: str):
         """
         Accept and register WebSocket connection
@@ -38,25 +110,29 @@ class ConnectionManager:
         """
         await websocket.accept()
 
-        # Initialize discussion set if needed
-        if discussion_id not in self.active_connections:
-            self.active_connections[discussion_id] = set()
-
         # Add connection
-        self.active_connections[discussion_id].add(websocket)
+        self.active_connections.setdefault(discussion_id, []).append(websocket)
         self.connection_mapping[websocket] = discussion_id
 
-        # Send welcome message
-        await self.send_personal_message(websocket, {
+        # Queue the welcome message first, then start the per-client sender:
+        # only the sender writes to the socket, so it goes out before any
+        # broadcast that arrives during the handshake
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        queue.put_nowait(_dumps({
             "type": "connected",
             "discussion_id": discussion_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso(),
             "message": "Connected to discussion"
-        })
+        }))
+        self.send_queues[websocket] = queue
+        self.sender_tasks[websocket] = asyncio.create_task(
+            self._sender(websocket, discussion_id, queue)
+        )
 
         logger.info(
-            f"WebSocket connected: {discussion_id[:8]} "
-            f"(total: {len(self.active_connections[discussion_id])} clients)"
+            "WebSocket connected: {:.8} (total: {} clients)",
+            discussion_id,
+            len(self.active_connections[discussion_id])
         )
 
     async def disconnect(self, websocket: WebSocket, discussion_id: str = None):
@@ -75,17 +151,29 @@ class ConnectionManager:
             return
 
         # Remove from active connections
-        if discussion_id in self.active_connections:
-            self.active_connections[discussion_id].discard(websocket)
+        connections = self.active_connections.get(discussion_id)
+        if connections is not None:
+            try:
+                connections.remove(websocket)
+            except ValueError:
+                pass
 
-            # Clean up empty sets
-            if not self.active_connections[discussion_id]:
+            # Clean up empty lists
+            if not connections:
                 del self.active_connections[discussion_id]
 
         # Remove from mapping
         self.connection_mapping.pop(websocket, None)
 
-        logger.info(f"WebSocket disconnected: {discussion_id[:8]}")
+        # Stop the sender and drop anything it hadn't sent yet
+        task = self.sender_tasks.pop(websocket, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        queue = self.send_queues.pop(websocket, None)
+        if queue is not None:
+            _drain(queue)
+
+        logger.info("WebSocket disconnected: {:.8}", discussion_id)
 
     async def broadcast(self, discussion_id: str, message: dict):
         """
@@ -96,41 +184,96 @@ class ConnectionManager:
             message: Message dict to send
         """
         if discussion_id not in self.active_connections:
-            logger.debug(f"No active connections for discussion {discussion_id[:8]}")
+            logger.debug("No active connections for discussion {:.8}", discussion_id)
             return
 
         # Add timestamp if not present
         if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat()
+            message["timestamp"] = now_iso()
+
+        # Serialize once and queue the same bytes for every client
+        await self.broadcast_raw(discussion_id, _dumps(message))
+
+    async def broadcast_raw(self, discussion_id: str, payload: bytes):
+        """
+        Broadcast an already-serialized JSON frame to a discussion's clients
+
+        Args:
+            discussion_id: Discussion to broadcast to
+            payload: UTF-8 JSON bytes, sent as-is
+        """
+        if discussion_id not in self.active_connections:
+            return
 
-        message_json = json.dumps(message)
-        dead_connections = set()
+        slow_connections = []
 
-        # Send to all clients
         for connection in self.active_connections[discussion_id]:
             try:
-                await connection.send_text(message_json)
-            except WebSocketDisconnect:
-                logger.warning(f"Client disconnected during broadcast")
-                dead_connections.add(connection)
-            except Exception as e:
-                logger.error(f"Failed to send message: {e}")
-                dead_connections.add(connection)
+                self.send_queues[connection].put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.warning("Client send queue full, dropping slow client")
+                slow_connections.append(connection)
 
-        # Clean up dead connections
-        for connection in dead_connections:
+        # Clean up slow connections
+        for connection in slow_connections:
             await self.disconnect(connection, discussion_id)
+            try:
+                await connection.close(code=1013, reason="Client too slow")
+            except Exception:
+                pass
 
         logger.debug(
-            f"Broadcast to {discussion_id[:8]}: "
-            f"{len(self.active_connections.get(discussion_id, set()))} clients, "
-            f"{len(dead_connections)} failed"
+            "Broadcast to {:.8}: {} clients, {} dropped",
+            discussion_id,
+            len(self.active_connections.get(discussion_id, ())),
+            len(slow_connections)
         )
 
+    async def _sender(self, websocket: WebSocket, discussion_id: str, queue: asyncio.Queue):
+        """
+        Send queued frames to one client until it fails or is disconnected
+
+        Args:
+            websocket: Target WebSocket
+            discussion_id: Discussion the client is connected to
+            queue: The client's outgoing frame queue
+        """
+        while True:
+            payload = await queue.get()
+            try:
+                await websocket.send_bytes(payload)
+            except WebSocketDisconnect:
+                logger.warning("Client disconnected during broadcast")
+                await self.disconnect(websocket, discussion_id)
+                return
+            except Exception as e:
+                logger.error("Failed to send message: {}", e)
+                await self.disconnect(websocket, discussion_id)
+                return
+            finally:
+                queue.task_done()
+
+    async def flush(self, discussion_id: str):
+        """
+        Wait until every queued frame for a discussion has been sent
+
+        Args:
+            discussion_id: Discussion to flush
+        """
+        queues = [
+            self.send_queues[connection]
+            for connection in self.active_connections.get(discussion_id, ())
+            if connection in self.send_queues
+        ]
+        await asyncio.gather(*(queue.join() for queue in queues))
+
     async def send_personal_message(self, websocket: WebSocket, message: dict):
         """
         Send message to specific client
 
+        Connected clients get it through their send queue, in order with
+        broadcasts; anything else is sent directly.
+
         Args:
             websocket: Target WebSocket
             message: Message dict to send
@@ -138,11 +281,30 @@ class ConnectionManager:
         try:
             # Add timestamp if not present
             if "timestamp" not in message:
-                message["timestamp"] = datetime.utcnow().isoformat()
+                message["timestamp"] = now_iso()
 
-            await websocket.send_json(message)
+            queue = self.send_queues.get(websocket)
+            if queue is None:
+                await send_json_fast(websocket, message)
+            else:
+                queue.put_nowait(_dumps(message))
         except Exception as e:
-            logger.error(f"Failed to send personal message: {e}")
+            logger.error("Failed to send personal message: {}", e)
+
+    async def _broadcast_frame(self, discussion_id: str, template: bytes, *values: Any):
+        """
+        Fill a pre-serialized frame template and broadcast it
+
+        Args:
+            discussion_id: Discussion to broadcast to
+            template: One of the *_FRAME templates
+            values: Values for every slot but the trailing timestamp
+        """
+        if discussion_id not in self.active_connections:
+            return
+
+        frame = template % (*map(_dumps, values), _dumps(now_iso()))
+        await self.broadcast_raw(discussion_id, frame)
 
     async def broadcast_agent_message(
         self,
@@ -162,15 +324,20 @@ class ConnectionManager:
             content: Message content
             turn_number: Turn number
         """
-        await self.broadcast(discussion_id, {
-            "type": "agent_message",
-            "data": {
-                "role_name": role_name,
-                "model": model,
-                "content": content,
-                "turn_number": turn_number
-            }
-        })
+        await self._broadcast_frame(
+            discussion_id, _AGENT_MESSAGE_FRAME,
+            role_name, model, content, turn_number
+        )
+
+    async def broadcast_agent_messages_batch(self, discussion_id: str, messages: list):
+        """
+        Broadcast several agent messages in a single frame
+
+        Args:
+            discussion_id: Discussion ID
+            messages: Agent message dicts (same fields as broadcast_agent_message)
+        """
+        await self._broadcast_frame(discussion_id, _AGENT_MESSAGES_BATCH_FRAME, messages)
 
     async def broadcast_consensus_update(
         self,
@@ -192,16 +359,10 @@ class ConnectionManager:
             agreements: List of agreements
             disagreements: List of disagreements
         """
-        await self.broadcast(discussion_id, {
-            "type": "consensus_update",
-            "data": {
-                "reached": reached,
-                "confidence": confidence,
-                "summary": summary,
-                "agreements": agreements,
-                "disagreements": disagreements
-            }
-        })
+        await self._broadcast_frame(
+            discussion_id, _CONSENSUS_UPDATE_FRAME,
+            reached, confidence, summary, agreements, disagreements
+        )
 
     async def broadcast_discussion_complete(
         self,
@@ -219,15 +380,10 @@ class ConnectionManager:
             consensus_reached: Whether consensus reached
             final_summary: Final summary
         """
-        await self.broadcast(discussion_id, {
-            "type": "discussion_complete",
-            "data": {
-                "total_turns": total_turns,
-                "consensus_reached": consensus_reached,
-                "final_summary": final_summary,
-                "status": "completed"
-            }
-        })
+        await self._broadcast_frame(
+            discussion_id, _DISCUSSION_COMPLETE_FRAME,
+            total_turns, consensus_reached, final_summary
+        )
 
     async def broadcast_error(self, discussion_id: str, error: str):
         """
@@ -237,10 +393,42 @@ class ConnectionManager:
             discussion_id: Discussion ID
             error: Error message
         """
-        await self.broadcast(discussion_id, {
-            "type": "error",
-            "error": error
-        })
+        await self._broadcast_frame(discussion_id, _ERROR_FRAME, error)
+
+    async def broadcast_discussion_stopped(self, discussion_id: str):
+        """
+        Broadcast that a discussion was stopped by the user
+
+        Args:
+            discussion_id: Discussion ID
+        """
+        await self._broadcast_frame(
+            discussion_id, _STOPPED_FRAME, discussion_id, now_iso()
+        )
+
+    async def broadcast_discussion_deleted(self, discussion_id: str):
+        """
+        Broadcast that a discussion was deleted
+
+        Args:
+            discussion_id: Discussion ID
+        """
+        await self._broadcast_frame(
+            discussion_id, _DELETED_FRAME, discussion_id, now_iso()
+        )
+
+    async def broadcast_user_message(self, discussion_id: str, content: str, user_id: str):
+        """
+        Broadcast a message the user sent into a discussion
+
+        Args:
+            discussion_id: Discussion ID
+            content: Message content
+            user_id: Sending user
+        """
+        await self._broadcast_frame(
+            discussion_id, _USER_MESSAGE_FRAME, content, user_id, now_iso()
+        )
 
     async def disconnect_all(self):
         """Disconnect all clients (for shutdown)"""
@@ -253,8 +441,13 @@ class ConnectionManager:
                 except:
                     pass
 
+        for task in self.sender_tasks.values():
+            task.cancel()
+
         self.active_connections.clear()
         self.connection_mapping.clear()
+        self.send_queues.clear()
+        self.sender_tasks.clear()
 
         logger.info("All WebSocket connections closed")
 
@@ -269,7 +462,7 @@ class ConnectionManager:
             Connection count
         """
         if discussion_id:
-            return len(self.active_connections.get(discussion_id, set()))
+            return len(self.active_connections.get(discussion_id, ()))
         else:
             return sum(len(conns) for conns in self.active_connections.values())
 
@@ -3,10 +3,45 @@ OpenRouter LLM Provider
 Unified access to multiple LLMs through OpenRouter API
 """
 import httpx
-from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
 from loguru import logger
 
 
+# Latest 2025 model mappings (user-friendly names → OpenRouter IDs)
+MODEL_ALIASES: Dict[str, str] = {
+    # OpenAI (latest 2025)
+    # IMPORTANT: gpt-5 = o1-preview (reasoning mode, empty output)
+    # Use gpt-5-chat for normal chat completions
+    "gpt-4": "openai/gpt-5-chat",
+    "gpt-4o": "openai/gpt-5-chat",
+    "gpt-4-turbo": "openai/gpt-5-chat",
+    "gpt-5": "openai/gpt-5-chat",
+    "gpt-5-chat": "openai/gpt-5-chat",
+
+    # Anthropic (latest 2025)
+    "claude-3-opus": "anthropic/claude-sonnet-4.5",
+    "claude-3-sonnet": "anthropic/claude-sonnet-4.5",
+    "claude-3.5-sonnet": "anthropic/claude-sonnet-4.5",
+    "claude-4.5": "anthropic/claude-sonnet-4.5",
+    "claude-sonnet-4.5": "anthropic/claude-sonnet-4.5",
+
+    # Google (latest 2025)
+    "gemini-pro": "google/gemini-2.5-pro",
+    "gemini-1.5-pro": "google/gemini-2.5-pro",
+    "gemini-2.5-pro": "google/gemini-2.5-pro",
+    "gemini-ultra": "google/gemini-2.5-pro",
+
+    # DeepSeek (latest 2025)
+    "deepseek": "deepseek/deepseek-v3.2-exp",
+    "deepseek-chat": "deepseek/deepseek-v3.2-exp",
+    "deepseek-v3.2": "deepseek/deepseek-v3.2-exp",
+
+    # Others
+    "mistral-large": "mistralai/mistral-large",
+}
+
+
 class OpenRouterClient:
     """
     Client for OpenRouter API to access multiple LLMs
@@ -18,11 +53,32 @@ class OpenRouterClient:
     - Mistral models
     """
 
-    def __init__(self, api_key: str, base_url: str = "https://openrouter.ai/api/v1"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://openrouter.ai/api/v1",
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.api_key = api_key
         self.base_url = base_url
         self.http_referer = "https://chat.noreika.lt"
         self.app_name = "CAMEL Discussion Engine"
+        # Optional caller-owned client, reused for every request
+        self.http_client = http_client
+
+    @asynccontextmanager
+    async def _client(self, timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Yield the shared HTTP client if one was injected
+
+        Otherwise a short-lived client is opened for the single request.
+        The shared client is left open; its owner closes it.
+        """
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                yield client
 
     async def chat_completion(
         self,
@@ -49,7 +105,7 @@ class OpenRouterClient:
             httpx.HTTPError: If API request fails
         """
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self._client(timeout=60.0) as client:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -121,7 +177,7 @@ class OpenRouterClient:
             Parsed JSON response as dict
         """
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self._client(timeout=60.0) as client:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -159,7 +215,7 @@ class OpenRouterClient:
             List of model information dicts
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._client(timeout=30.0) as client:
                 response = await client.get(
                     f"{self.base_url}/models",
                     headers={
@@ -187,40 +243,7 @@ class OpenRouterClient:
         Returns:
             OpenRouter-compatible model identifier
         """
-        # Latest 2025 model mappings (user-friendly names → OpenRouter IDs)
-        model_mapping = {
-            # OpenAI (latest 2025)
-            # IMPORTANT: gpt-5 = o1-preview (reasoning mode, empty output)
-            # Use gpt-5-chat for normal chat completions
-            "gpt-4": "openai/gpt-5-chat",
-            "gpt-4o": "openai/gpt-5-chat",
-            "gpt-4-turbo": "openai/gpt-5-chat",
-            "gpt-5": "openai/gpt-5-chat",
-            "gpt-5-chat": "openai/gpt-5-chat",
-
-            # Anthropic (latest 2025)
-            "claude-3-opus": "anthropic/claude-sonnet-4.5",
-            "claude-3-sonnet": "anthropic/claude-sonnet-4.5",
-            "claude-3.5-sonnet": "anthropic/claude-sonnet-4.5",
-            "claude-4.5": "anthropic/claude-sonnet-4.5",
-            "claude-sonnet-4.5": "anthropic/claude-sonnet-4.5",
-
-            # Google (latest 2025)
-            "gemini-pro": "google/gemini-2.5-pro",
-            "gemini-1.5-pro": "google/gemini-2.5-pro",
-            "gemini-2.5-pro": "google/gemini-2.5-pro",
-            "gemini-ultra": "google/gemini-2.5-pro",
-
-            # DeepSeek (latest 2025)
-            "deepseek": "deepseek/deepseek-v3.2-exp",
-            "deepseek-chat": "deepseek/deepseek-v3.2-exp",
-            "deepseek-v3.2": "deepseek/deepseek-v3.2-exp",
-
-            # Others
-            "mistral-large": "mistralai/mistral-large",
-        }
-
-        return model_mapping.get(model_preference.lower(), model_preference)
+        return MODEL_ALIASES.get(model_preference.lower(), model_preference)
 
 
 class LLMProviderFactory:
@@ -2,9 +2,11 @@
 Discussion Orchestrator
 Orchestrates multi-agent discussions with dynamic role creation and emergent communication
 """
+import asyncio
 import uuid
 from typing import List, Dict, Optional
 from datetime import datetime
+import httpx
 from pydantic import BaseModel
 from loguru import logger
 
@@ -70,9 +72,13 @@ class DiscussionOrchestrator:
         self,
         openrouter_api_key: str,
         max_turns: int = 20,
-        consensus_threshold: float = 0.85
+        consensus_threshold: float = 0.85,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
-        self.llm_client = OpenRouterClient(api_key=openrouter_api_key)
+        self.llm_client = OpenRouterClient(
+            api_key=openrouter_api_key,
+            http_client=http_client
+        )
         self.role_creator = RoleCreator(llm_client=self.llm_client)
         self.consensus_detector = ConsensusDetector(
             llm_client=self.llm_client,
@@ -138,7 +144,8 @@ class DiscussionOrchestrator:
     async def run_discussion(
         self,
         discussion_id: str,
-        max_turns: Optional[int] = None
+        max_turns: Optional[int] = None,
+        parallel_rounds: bool = False
     ) -> DiscussionResult:
         """
         Run discussion until consensus or max turns
@@ -146,6 +153,8 @@ class DiscussionOrchestrator:
         Args:
             discussion_id: Discussion identifier
             max_turns: Override default max turns
+            parallel_rounds: Collect the opening statements of all agents
+                concurrently before the AI-moderated turns start
 
         Returns:
             Discussion result with final summary
@@ -166,6 +175,14 @@ class DiscussionOrchestrator:
             f"Participants: {', '.join(r.name for r in discussion.roles)}"
         )
 
+        # Opening statements don't depend on each other, so they can be
+        # generated in one concurrent round
+        if parallel_rounds:
+            await self.run_round_parallel(
+                discussion_id,
+                [role.name for role in discussion.roles[:max_turns]]
+            )
+
         # Main discussion loop
         while discussion.current_turn < max_turns:
             discussion.current_turn += 1
@@ -209,6 +226,57 @@ class DiscussionOrchestrator:
 
         return result
 
+    async def run_round_parallel(
+        self,
+        discussion_id: str,
+        role_names: Optional[List[str]] = None
+    ) -> List[DiscussionMessage]:
+        """
+        Let several agents respond to the current transcript concurrently
+
+        Each agent sees the same conversation snapshot, so only use this for
+        turns that don't build on each other (e.g. opening statements or
+        independent critiques). Messages are appended in role order, one
+        turn each.
+
+        Args:
+            discussion_id: Discussion identifier
+            role_names: Agents taking part in the round (default: all)
+
+        Returns:
+            Messages added to the discussion
+        """
+        discussion = self.active_discussions.get(discussion_id)
+        if not discussion:
+            raise ValueError(f"Discussion {discussion_id} not found")
+
+        roles = [
+            role for role in discussion.roles
+            if role_names is None or role.name in role_names
+        ]
+
+        results = await asyncio.gather(
+            *(self.generate_agent_message(discussion, role) for role in roles),
+            return_exceptions=True
+        )
+
+        added = []
+        for role, message in zip(roles, results):
+            if isinstance(message, Exception):
+                logger.error(f"Parallel round failed for {role.name}: {str(message)}")
+                continue
+
+            # Generated against the same snapshot; renumber in transcript order
+            discussion.current_turn += 1
+            message.id = len(discussion.messages) + 1
+            message.turn_number = discussion.current_turn
+            self._add_message(discussion, message)
+            added.append(message)
+
+        logger.debug(f"Parallel round: {len(added)}/{len(roles)} agents responded")
+
+        return added
+
     async def select_next_speaker(self, discussion: Discussion) -> RoleDefinition:
         """
         AI-driven selection of next speaker (not round-robin)
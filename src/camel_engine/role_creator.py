@@ -2,7 +2,9 @@
 Dynamic Role Creator
 Analyzes topics and creates appropriate expert roles for discussions
 """
+import hashlib
 import json
+from collections import OrderedDict
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field
 from loguru import logger
@@ -38,15 +40,31 @@ class RoleCreator:
     3. Create tailored system prompts
     """
 
-    def __init__(self, llm_client: OpenRouterClient, analysis_model: str = "openai/gpt-5-chat"):
+    def __init__(
+        self,
+        llm_client: OpenRouterClient,
+        analysis_model: str = "openai/gpt-5-chat",
+        analysis_cache_size: int = 256
+    ):
         self.llm_client = llm_client
         self.analysis_model = analysis_model
 
+        # LRU of successful topic analyses, keyed on the normalized topic
+        self.analysis_cache_size = analysis_cache_size
+        self._analysis_cache: "OrderedDict[str, TopicAnalysis]" = OrderedDict()
+
+    @staticmethod
+    def _analysis_key(topic: str) -> str:
+        """Cache key for a topic, ignoring case and whitespace differences"""
+        normalized = " ".join(topic.lower().split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
     async def create_roles(
         self,
         topic: str,
         num_roles: int = 4,
-        model_preferences: Optional[List[str]] = None
+        model_preferences: Optional[List[str]] = None,
+        analysis: Optional[TopicAnalysis] = None
     ) -> List[RoleDefinition]:
         """
         Analyze topic and create appropriate expert roles
@@ -55,14 +73,16 @@ class RoleCreator:
             topic: Discussion topic
             num_roles: Number of roles to create
             model_preferences: Preferred models for roles (if any)
+            analysis: Existing analysis of this topic, to skip re-analyzing
 
         Returns:
             List of role definitions
         """
         logger.info(f"Creating {num_roles} roles for topic: {topic}")
 
-        # Step 1: Analyze the topic
-        analysis = await self.analyze_topic(topic)
+        # Step 1: Analyze the topic (unless the caller already has)
+        if analysis is None:
+            analysis = await self.analyze_topic(topic)
         logger.debug(f"Topic analysis: {analysis.primary_domain}, complexity {analysis.complexity}")
 
         # Step 2: Generate role definitions
@@ -84,7 +104,17 @@ class RoleCreator:
 
         Returns:
             Structured topic analysis
+
+        Successful analyses are cached per normalized topic, so repeat
+        topics skip the LLM call. Fallback analyses are never cached.
         """
+        key = self._analysis_key(topic)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            logger.debug(f"Topic analysis cache hit: {topic[:50]}")
+            return cached
+
         prompt = f"""Analyze this discussion topic and determine:
 1. Primary domain (medical, technical, business, scientific, social, etc.)
 2. Sub-domains involved
@@ -120,7 +150,7 @@ Example:
                 temperature=0.3  # Low temperature for consistent analysis
             )
 
-            return TopicAnalysis(**response)
+            analysis = TopicAnalysis(**response)
 
         except Exception as e:
             logger.error(f"Topic analysis failed: {str(e)}")
@@ -133,6 +163,12 @@ Example:
                 recommended_expert_types=["Expert 1", "Expert 2", "Expert 3", "Expert 4"]
             )
 
+        self._analysis_cache[key] = analysis
+        if len(self._analysis_cache) > self.analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+
+        return analysis
+
     async def generate_roles(
         self,
         analysis: TopicAnalysis,
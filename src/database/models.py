@@ -1,7 +1,7 @@
 """
 Database models for CAMEL Discussion API
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -25,7 +25,12 @@ class Discussion(Base):
     consensus_confidence = Column(Float, nullable=True)
 
     # Relationships
-    messages = relationship("Message", back_populates="discussion", cascade="all, delete-orphan")
+    messages = relationship(
+        "Message",
+        back_populates="discussion",
+        cascade="all, delete-orphan",
+        passive_deletes=True  # The database deletes messages (ON DELETE CASCADE)
+    )
 
 
 class Message(Base):
@@ -33,7 +38,7 @@ class Message(Base):
     __tablename__ = "messages"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    discussion_id = Column(String, ForeignKey("discussions.id"), nullable=False)
+    discussion_id = Column(String, ForeignKey("discussions.id", ondelete="CASCADE"), nullable=False)
     role_name = Column(String, nullable=False)  # e.g., "Neurologist", "User"
     model = Column(String, nullable=False)  # e.g., "gpt-4", "user"
     content = Column(Text, nullable=False)
@@ -45,13 +50,18 @@ class Message(Base):
     # Relationships
     discussion = relationship("Discussion", back_populates="messages")
 
+    # Serves the chronological, keyset-paginated message listing
+    __table_args__ = (
+        Index("ix_messages_discussion_created_id", "discussion_id", "created_at", "id"),
+    )
+
 
 class AgentPerformance(Base):
     """Agent performance metrics for monitoring and optimization"""
     __tablename__ = "agent_performance"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    discussion_id = Column(String, ForeignKey("discussions.id"), nullable=False)
+    discussion_id = Column(String, ForeignKey("discussions.id", ondelete="CASCADE"), nullable=False)
     role_name = Column(String, nullable=False)  # Which agent
     model = Column(String, nullable=False)  # Which LLM model
     response_time_ms = Column(Integer, nullable=True)  # Response time in milliseconds
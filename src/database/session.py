@@ -1,6 +1,7 @@
 """
 Database session management
 """
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from contextlib import asynccontextmanager
@@ -8,7 +9,7 @@ from typing import AsyncGenerator
 from loguru import logger
 
 from src.utils.config import settings
-from src.database.models import Base
+from src.database.models import AgentPerformance, Base, Message
 
 
 # Create async engine
@@ -18,6 +19,14 @@ engine = create_async_engine(
     future=True
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        """SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Create async session factory
 async_session_maker = sessionmaker(
     engine,
@@ -26,10 +35,54 @@ async_session_maker = sessionmaker(
 )
 
 
+def _migrate_cascade_foreign_keys(connection):
+    """
+    Rebuild child tables whose discussions FK predates ON DELETE CASCADE
+
+    create_all never alters existing tables, and SQLite can't change a
+    foreign key in place: the table is renamed, recreated from the model,
+    refilled and the old copy dropped.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    for table in (Message.__table__, AgentPerformance.__table__):
+        foreign_keys = connection.exec_driver_sql(
+            f'PRAGMA foreign_key_list("{table.name}")'
+        ).mappings().all()
+        if not any(
+            fk["table"] == "discussions" and fk["on_delete"].upper() != "CASCADE"
+            for fk in foreign_keys
+        ):
+            continue
+
+        logger.info("Migrating {} to ON DELETE CASCADE", table.name)
+        old_name = f"{table.name}_old"
+        connection.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"')
+
+        # Indexes keep their names when the table is renamed
+        for index in table.indexes:
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS "{index.name}"')
+        table.create(connection)
+
+        old_columns = {
+            row["name"]
+            for row in connection.exec_driver_sql(
+                f'PRAGMA table_info("{old_name}")'
+            ).mappings()
+        }
+        columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in old_columns)
+        connection.exec_driver_sql(
+            f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old_name}"'
+        )
+        connection.exec_driver_sql(f'DROP TABLE "{old_name}"')
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_migrate_cascade_foreign_keys)
     logger.info("✅ Database initialized")
 
 
@@ -0,0 +1,24 @@
+"""
+Timestamp helpers for API payloads
+"""
+import time
+from datetime import datetime
+
+
+_cached_second = -1
+_cached_iso = ""
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as an ISO-8601 string, at one-second resolution
+
+    The string is rebuilt at most once per second, so payloads sent in
+    bursts share it. Ordering within a second comes from ids/turn numbers.
+    """
+    global _cached_second, _cached_iso
+    second = int(time.time())
+    if second != _cached_second:
+        _cached_iso = datetime.utcfromtimestamp(second).isoformat()
+        _cached_second = second
+    return _cached_iso
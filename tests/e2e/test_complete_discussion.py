@@ -47,6 +47,17 @@ async def send_user_message(discussion_id: str, content: str):
         return response.json()
 
 
+def agent_messages_from(frames: list) -> list:
+    """Flatten agent messages out of agent_message and agent_messages_batch frames"""
+    messages = []
+    for frame in frames:
+        if frame["type"] == "agent_message":
+            messages.append(frame["data"])
+        elif frame["type"] == "agent_messages_batch":
+            messages.extend(frame["data"])
+    return messages
+
+
 async def get_discussion_messages(discussion_id: str, limit: int = 100):
     """Helper to get discussion messages"""
     async with AsyncClient(app=app, base_url="http://test") as client:
@@ -139,15 +150,11 @@ async def test_complete_discussion_flow():
     assert len(messages_received) > 0, "Should receive at least some messages"
 
     # Verify agent messages were received
-    agent_messages = [m for m in messages_received if m["type"] == "agent_message"]
+    agent_messages = agent_messages_from(messages_received)
     assert len(agent_messages) > 0, "Should have agent messages"
 
     # Check that multiple agents participated
-    agents = set(
-        m["data"]["role_name"]
-        for m in messages_received
-        if m["type"] == "agent_message"
-    )
+    agents = set(m["role_name"] for m in agent_messages)
     assert len(agents) >= 2, "Multiple agents should participate"
 
     # Verify discussion reached conclusion
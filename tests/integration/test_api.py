@@ -4,11 +4,14 @@ Tests for FastAPI endpoints and WebSocket functionality
 """
 import pytest
 import asyncio
+from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 import json
 
 from src.api.main import app
+from src.api.routes import roles as roles_routes
+from src.camel_engine.role_creator import RoleDefinition, TopicAnalysis
 from src.database.session import engine, Base
 from src.utils.config import settings
 
@@ -125,6 +128,47 @@ def test_list_providers():
     assert "count" in provider
 
 
+def test_list_models_gzip():
+    """Test model listing is served gzip-compressed when accepted"""
+    response = client.get("/api/models/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["count"] > 0
+
+    plain = client.get("/api/models/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != response.headers["etag"]
+
+    refused = client.get("/api/models/", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in refused.headers
+    assert refused.headers["etag"] == plain.headers["etag"]
+
+    not_modified = client.get(
+        "/api/models/",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["vary"] == "Accept-Encoding"
+
+
+def test_list_models_if_none_match_list():
+    """Test If-None-Match lists, weak tags and * all produce a 304"""
+    etag = client.get("/api/models/", headers={"Accept-Encoding": "identity"}).headers["etag"]
+
+    for if_none_match in (f'"stale", {etag}', f"W/{etag}", "*"):
+        response = client.get(
+            "/api/models/",
+            headers={"Accept-Encoding": "identity", "If-None-Match": if_none_match}
+        )
+        assert response.status_code == 304
+
+    response = client.get(
+        "/api/models/",
+        headers={"Accept-Encoding": "identity", "If-None-Match": '"stale", W/"other"'}
+    )
+    assert response.status_code == 200
+
+
 # ============================================================================
 # ROLES API TESTS
 # ============================================================================
@@ -178,6 +222,66 @@ def test_analyze_topic():
     assert "suggested_num_roles" in data
 
 
+SAMPLE_ANALYSIS = TopicAnalysis(
+    primary_domain="medical",
+    sub_domains=["neurology"],
+    complexity=4,
+    key_aspects=["diagnosis", "treatment"],
+    recommended_expert_types=["Neurologist", "Pharmacologist"]
+)
+
+
+def test_analyze_topic_mocked():
+    """Test topic analysis response maps the TopicAnalysis fields"""
+    with patch.object(
+        roles_routes.role_creator, "analyze_topic", AsyncMock(return_value=SAMPLE_ANALYSIS)
+    ):
+        response = client.post(
+            "/api/roles/analyze-topic",
+            json={"topic": "What are the best strategies for treating chronic migraine?"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["domain"] == "medical"
+    assert data["complexity"] == 4
+    assert data["key_aspects"] == ["diagnosis", "treatment"]
+    assert data["recommended_expertise"] == ["Neurologist", "Pharmacologist"]
+    assert data["suggested_num_roles"] == 6
+
+
+def test_preview_roles_mocked():
+    """Test role preview builds its response from the analysis and roles"""
+    roles = [
+        RoleDefinition(
+            name="Neurologist",
+            expertise="Brain disorders",
+            perspective="Clinical",
+            model="openai/gpt-4",
+            system_prompt="You are a neurologist."
+        )
+    ]
+
+    with patch.object(
+        roles_routes.role_creator, "analyze_topic", AsyncMock(return_value=SAMPLE_ANALYSIS)
+    ), patch.object(
+        roles_routes.role_creator, "create_roles", AsyncMock(return_value=roles)
+    ) as create_roles:
+        response = client.post(
+            "/api/roles/preview",
+            json={"topic": "What are the best strategies for treating chronic migraine?", "num_roles": 2}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["roles"] == [roles[0].model_dump()]
+    assert data["topic_analysis"]["domain"] == "medical"
+    assert data["topic_analysis"]["recommended_expertise"] == ["Neurologist", "Pharmacologist"]
+
+    # The preview's analysis is reused instead of analyzing again
+    assert create_roles.call_args.kwargs["analysis"] is SAMPLE_ANALYSIS
+
+
 def test_get_roles_by_domain():
     """Test getting roles by domain"""
     response = client.get("/api/roles/by-domain/medical")
@@ -329,6 +433,47 @@ async def test_get_discussion_messages(test_topic, setup_database):
             assert "created_at" in message
 
 
+@pytest.mark.integration
+async def test_get_discussion_messages_cursor(test_topic, setup_database):
+    """Test paging through messages with next_cursor"""
+    discussion_id = await test_create_discussion(test_topic, setup_database)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        # Wait for some messages
+        await asyncio.sleep(5)
+
+        response = await ac.get(
+            f"/api/discussions/{discussion_id}/messages",
+            params={"limit": 1}
+        )
+        assert response.status_code == 200
+        first_page = response.json()
+        assert "next_cursor" in first_page
+
+        if first_page["next_cursor"]:
+            response = await ac.get(
+                f"/api/discussions/{discussion_id}/messages",
+                params={"limit": 1, **first_page["next_cursor"]}
+            )
+            assert response.status_code == 200
+            second_page = response.json()
+
+            if second_page["count"] > 0:
+                assert second_page["messages"][0]["id"] != first_page["messages"][0]["id"]
+
+
+@pytest.mark.integration
+async def test_get_discussion_messages_partial_cursor():
+    """Test that a cursor with only one of after_ts/after_id is rejected"""
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for params in ({"after_id": 5}, {"after_ts": "2025-10-12T10:00:00"}):
+            response = await ac.get(
+                "/api/discussions/any_id/messages",
+                params={"limit": 10, **params}
+            )
+            assert response.status_code == 422
+
+
 @pytest.mark.integration
 async def test_stop_discussion(test_topic, setup_database):
     """Test stopping a discussion"""
@@ -603,3 +603,68 @@ def test_discussion_id_generation(orchestrator):
 
     # All IDs should be unique
     assert len(ids) == 100
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client_is_reused():
+    """Test that an injected HTTP client is used for every LLM call"""
+    response = MagicMock()
+    response.raise_for_status = MagicMock()
+    response.json.return_value = {"choices": [{"message": {"content": "Hello"}}]}
+
+    http_client = MagicMock()
+    http_client.post = AsyncMock(return_value=response)
+
+    orchestrator = DiscussionOrchestrator(
+        openrouter_api_key="test-api-key-mock",
+        http_client=http_client
+    )
+    assert orchestrator.llm_client.http_client is http_client
+
+    for _ in range(3):
+        content = await orchestrator.llm_client.chat_completion(
+            model="openai/gpt-5-chat",
+            messages=[{"role": "user", "content": "Hi"}]
+        )
+        assert content == "Hello"
+
+    assert http_client.post.await_count == 3
+    # The caller owns the shared client, so it must stay open
+    http_client.aclose.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_round_parallel(orchestrator, sample_roles):
+    """Test that a parallel round adds one ordered message per agent"""
+    discussion_id = "disc_test_parallel"
+
+    orchestrator.active_discussions[discussion_id] = Discussion(
+        id=discussion_id,
+        topic="Test topic",
+        user_id="test-user",
+        roles=sample_roles,
+        status="active",
+        current_turn=0,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+
+    async def fake_message(discussion, role):
+        return DiscussionMessage(
+            id=len(discussion.messages) + 1,
+            discussion_id=discussion.id,
+            role_name=role.name,
+            model=role.model,
+            content=f"Opening from {role.name}",
+            turn_number=discussion.current_turn,
+            created_at=datetime.utcnow()
+        )
+
+    with patch.object(orchestrator, 'generate_agent_message', side_effect=fake_message):
+        added = await orchestrator.run_round_parallel(discussion_id)
+
+    discussion = orchestrator.get_discussion(discussion_id)
+    assert [m.role_name for m in added] == [r.name for r in sample_roles]
+    assert [m.id for m in discussion.messages] == [1, 2, 3]
+    assert [m.turn_number for m in discussion.messages] == [1, 2, 3]
+    assert discussion.current_turn == 3
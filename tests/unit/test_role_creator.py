@@ -123,6 +123,38 @@ async def test_analyze_medical_topic(role_creator):
             assert role.model
 
 
+@pytest.mark.asyncio
+async def test_topic_analysis_is_cached(role_creator):
+    """Test repeat topics reuse the cached analysis instead of calling the LLM"""
+    with patch.object(role_creator, 'llm_client') as mock_llm:
+        mock_llm.chat_completion_structured = AsyncMock(return_value={
+            "primary_domain": "medical",
+            "sub_domains": ["neurology"],
+            "complexity": 4,
+            "key_aspects": ["diagnosis"],
+            "recommended_expert_types": ["Neurologist"]
+        })
+
+        first = await role_creator.analyze_topic("Best treatment for chronic migraine")
+        second = await role_creator.analyze_topic("  best treatment for   CHRONIC migraine ")
+
+        assert second is first
+        assert mock_llm.chat_completion_structured.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_topic_analysis_fallback_not_cached(role_creator):
+    """Test a failed analysis falls back without poisoning the cache"""
+    with patch.object(role_creator, 'llm_client') as mock_llm:
+        mock_llm.chat_completion_structured = AsyncMock(side_effect=Exception("LLM API error"))
+
+        analysis = await role_creator.analyze_topic("Best treatment for chronic migraine")
+        assert analysis.primary_domain == "general"
+
+        await role_creator.analyze_topic("Best treatment for chronic migraine")
+        assert mock_llm.chat_completion_structured.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_analyze_technical_topic(role_creator):
     """Test role creation for technical topic"""
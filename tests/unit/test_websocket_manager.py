@@ -4,6 +4,7 @@ Unit tests for WebSocket ConnectionManager
 Tests WebSocket connection management, broadcasting, and connection lifecycle.
 """
 
+import asyncio
 import pytest
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -23,6 +24,7 @@ def mock_websocket():
     ws = AsyncMock(spec=WebSocket)
     ws.send_text = AsyncMock()
     ws.send_json = AsyncMock()
+    ws.send_bytes = AsyncMock()
     ws.accept = AsyncMock()
     ws.close = AsyncMock()
     return ws
@@ -97,9 +99,9 @@ async def test_broadcast_message_to_all_clients(connection_manager):
     ws2 = AsyncMock(spec=WebSocket)
     ws3 = AsyncMock(spec=WebSocket)
 
-    ws1.send_text = AsyncMock()
-    ws2.send_text = AsyncMock()
-    ws3.send_text = AsyncMock()
+    ws1.send_bytes = AsyncMock()
+    ws2.send_bytes = AsyncMock()
+    ws3.send_bytes = AsyncMock()
 
     await connection_manager.connect(ws1, discussion_id)
     await connection_manager.connect(ws2, discussion_id)
@@ -108,12 +110,15 @@ async def test_broadcast_message_to_all_clients(connection_manager):
     message = {"type": "test", "data": "broadcast test"}
 
     await connection_manager.broadcast(discussion_id, message)
+    await connection_manager.flush(discussion_id)
 
-    # All clients should receive the message
-    message_json = json.dumps(message)
-    ws1.send_text.assert_called_once_with(message_json)
-    ws2.send_text.assert_called_once_with(message_json)
-    ws3.send_text.assert_called_once_with(message_json)
+    # All clients should receive the same serialized payload
+    # (the first send_bytes call on each is the welcome message)
+    payload = ws1.send_bytes.call_args[0][0]
+    assert json.loads(payload) == message
+    for ws in (ws1, ws2, ws3):
+        assert ws.send_bytes.call_count == 2
+        assert ws.send_bytes.call_args[0][0] is payload
 
 
 @pytest.mark.asyncio
@@ -135,21 +140,70 @@ async def test_broadcast_handles_dead_connections(connection_manager):
     ws_working = AsyncMock(spec=WebSocket)
     ws_dead = AsyncMock(spec=WebSocket)
 
-    ws_working.send_text = AsyncMock()
-    ws_dead.send_text = AsyncMock(side_effect=Exception("Connection closed"))
+    ws_working.send_bytes = AsyncMock()
+    ws_dead.send_bytes = AsyncMock()
 
     await connection_manager.connect(ws_working, discussion_id)
     await connection_manager.connect(ws_dead, discussion_id)
 
+    # Fail only the broadcast, not the welcome message sent on connect
+    ws_dead.send_bytes.side_effect = Exception("Connection closed")
+
     message = {"type": "test", "data": "test"}
 
     await connection_manager.broadcast(discussion_id, message)
+    await connection_manager.flush(discussion_id)
 
     # Dead connection should be removed
     assert ws_working in connection_manager.active_connections[discussion_id]
     assert ws_dead not in connection_manager.active_connections[discussion_id]
 
 
+@pytest.mark.asyncio
+async def test_broadcast_drops_slow_client(connection_manager):
+    """Test that a client whose send queue fills up is dropped"""
+    discussion_id = "disc_test_slow"
+
+    ws_fast = AsyncMock(spec=WebSocket)
+    ws_slow = AsyncMock(spec=WebSocket)
+
+    ws_fast.send_bytes = AsyncMock()
+    ws_slow.send_bytes = AsyncMock()
+
+    with patch("src.api.websocket.manager.SEND_QUEUE_SIZE", 2):
+        await connection_manager.connect(ws_fast, discussion_id)
+        await connection_manager.connect(ws_slow, discussion_id)
+
+    # The slow client never finishes a send
+    async def never_sends(payload):
+        await asyncio.Event().wait()
+
+    ws_slow.send_bytes.side_effect = never_sends
+
+    # First frame is in flight on the slow client; two more fill its queue
+    # and the next overflows it. The fast client keeps up throughout.
+    for i in range(4):
+        await connection_manager.broadcast(discussion_id, {"type": "test", "data": i})
+        await asyncio.sleep(0)
+
+    assert ws_fast in connection_manager.active_connections[discussion_id]
+    assert ws_slow not in connection_manager.active_connections[discussion_id]
+    ws_slow.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_welcome_message_sent_before_broadcasts(connection_manager, mock_websocket):
+    """Test that a broadcast during the handshake goes out after the welcome"""
+    discussion_id = "disc_test_welcome"
+
+    await connection_manager.connect(mock_websocket, discussion_id)
+    await connection_manager.broadcast(discussion_id, {"type": "test", "data": "early"})
+    await connection_manager.flush(discussion_id)
+
+    sent = [json.loads(call[0][0])["type"] for call in mock_websocket.send_bytes.call_args_list]
+    assert sent == ["connected", "test"]
+
+
 @pytest.mark.asyncio
 async def test_send_personal_message(connection_manager, mock_websocket):
     """Test sending personal message to specific client"""
@@ -160,13 +214,14 @@ async def test_send_personal_message(connection_manager, mock_websocket):
     message = {"type": "personal", "data": "just for you"}
 
     await connection_manager.send_personal_message(mock_websocket, message)
+    await connection_manager.flush(discussion_id)
 
-    # send_personal_message uses send_json(), not send_text()
-    # Note: send_json is called twice - once by connect() for welcome message, once by our call
-    assert mock_websocket.send_json.call_count == 2
+    # send_personal_message sends binary JSON frames via send_bytes()
+    # Note: send_bytes is called twice - once by connect() for welcome message, once by our call
+    assert mock_websocket.send_bytes.call_count == 2
 
     # Check the second call (our personal message)
-    sent_data = mock_websocket.send_json.call_args_list[1][0][0]
+    sent_data = json.loads(mock_websocket.send_bytes.call_args_list[1][0][0])
     assert sent_data["type"] == "personal"
     assert sent_data["data"] == "just for you"
     assert "timestamp" in sent_data  # Timestamp is added automatically
@@ -177,7 +232,7 @@ async def test_send_agent_message(connection_manager):
     """Test sending agent message via convenience method"""
     discussion_id = "disc_test_agent_msg"
     ws = AsyncMock(spec=WebSocket)
-    ws.send_text = AsyncMock()
+    ws.send_bytes = AsyncMock()
 
     await connection_manager.connect(ws, discussion_id)
 
@@ -189,10 +244,12 @@ async def test_send_agent_message(connection_manager):
         content="This is my analysis...",
         turn_number=5
     )
+    await connection_manager.flush(discussion_id)
 
     # Should have broadcast message with correct structure
-    ws.send_text.assert_called_once()
-    sent_data = json.loads(ws.send_text.call_args[0][0])
+    # send_bytes is called twice - welcome message, then the broadcast
+    assert ws.send_bytes.call_count == 2
+    sent_data = json.loads(ws.send_bytes.call_args[0][0])
 
     assert sent_data["type"] == "agent_message"
     assert sent_data["data"]["role_name"] == "Expert A"
@@ -201,12 +258,78 @@ async def test_send_agent_message(connection_manager):
     assert sent_data["data"]["turn_number"] == 5
 
 
+@pytest.mark.asyncio
+async def test_send_agent_messages_batch(connection_manager):
+    """Test sending several agent messages in one frame"""
+    discussion_id = "disc_test_agent_batch"
+    ws = AsyncMock(spec=WebSocket)
+    ws.send_bytes = AsyncMock()
+
+    await connection_manager.connect(ws, discussion_id)
+
+    messages = [
+        {"role_name": "Expert A", "model": "gpt-4", "content": "First", "turn_number": 1},
+        {"role_name": "Expert B", "model": "claude-3-opus", "content": "Second", "turn_number": 2}
+    ]
+    await connection_manager.broadcast_agent_messages_batch(discussion_id, messages)
+    await connection_manager.flush(discussion_id)
+
+    # One frame for the whole batch (after the welcome message)
+    assert ws.send_bytes.call_count == 2
+    sent_data = json.loads(ws.send_bytes.call_args[0][0])
+
+    assert sent_data["type"] == "agent_messages_batch"
+    assert sent_data["data"] == messages
+
+
+@pytest.mark.asyncio
+async def test_send_user_message(connection_manager):
+    """Test the pre-serialized user message frame is valid JSON"""
+    discussion_id = "disc_test_user_msg"
+    ws = AsyncMock(spec=WebSocket)
+    ws.send_bytes = AsyncMock()
+
+    await connection_manager.connect(ws, discussion_id)
+
+    content = 'Consider "option X" \\ {braces} 😀'
+    await connection_manager.broadcast_user_message(discussion_id, content, "user_1")
+    await connection_manager.flush(discussion_id)
+
+    sent_data = json.loads(ws.send_bytes.call_args[0][0])
+
+    assert sent_data["type"] == "user_message"
+    assert sent_data["data"]["role_name"] == "User"
+    assert sent_data["data"]["content"] == content
+    assert sent_data["data"]["user_id"] == "user_1"
+    assert sent_data["data"]["timestamp"] == sent_data["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_send_discussion_stopped(connection_manager):
+    """Test sending discussion stopped via convenience method"""
+    discussion_id = "disc_test_stopped"
+    ws = AsyncMock(spec=WebSocket)
+    ws.send_bytes = AsyncMock()
+
+    await connection_manager.connect(ws, discussion_id)
+
+    await connection_manager.broadcast_discussion_stopped(discussion_id)
+    await connection_manager.flush(discussion_id)
+
+    sent_data = json.loads(ws.send_bytes.call_args[0][0])
+
+    assert sent_data["type"] == "discussion_stopped"
+    assert sent_data["data"]["discussion_id"] == discussion_id
+    assert sent_data["data"]["message"] == "Discussion stopped by user"
+    assert "timestamp" in sent_data
+
+
 @pytest.mark.asyncio
 async def test_send_consensus_update(connection_manager):
     """Test sending consensus update via convenience method"""
     discussion_id = "disc_test_consensus_msg"
     ws = AsyncMock(spec=WebSocket)
-    ws.send_text = AsyncMock()
+    ws.send_bytes = AsyncMock()
 
     await connection_manager.connect(ws, discussion_id)
 
@@ -219,9 +342,11 @@ async def test_send_consensus_update(connection_manager):
         agreements=["Point 1", "Point 2"],
         disagreements=[]
     )
+    await connection_manager.flush(discussion_id)
 
-    ws.send_text.assert_called_once()
-    sent_data = json.loads(ws.send_text.call_args[0][0])
+    # send_bytes is called twice - welcome message, then the broadcast
+    assert ws.send_bytes.call_count == 2
+    sent_data = json.loads(ws.send_bytes.call_args[0][0])
 
     assert sent_data["type"] == "consensus_update"
     assert sent_data["data"]["reached"] is True
@@ -236,7 +361,7 @@ async def test_send_discussion_complete(connection_manager):
     """Test sending discussion complete notification"""
     discussion_id = "disc_test_complete_msg"
     ws = AsyncMock(spec=WebSocket)
-    ws.send_text = AsyncMock()
+    ws.send_bytes = AsyncMock()
 
     await connection_manager.connect(ws, discussion_id)
 
@@ -247,9 +372,11 @@ async def test_send_discussion_complete(connection_manager):
         consensus_reached=True,
         final_summary="Discussion concluded with consensus."
     )
+    await connection_manager.flush(discussion_id)
 
-    ws.send_text.assert_called_once()
-    sent_data = json.loads(ws.send_text.call_args[0][0])
+    # send_bytes is called twice - welcome message, then the broadcast
+    assert ws.send_bytes.call_count == 2
+    sent_data = json.loads(ws.send_bytes.call_args[0][0])
 
     assert sent_data["type"] == "discussion_complete"
     assert sent_data["data"]["total_turns"] == 12
@@ -310,8 +437,8 @@ def test_active_discussions_list(connection_manager):
     disc1 = "disc_1"
     disc2 = "disc_2"
 
-    connection_manager.active_connections[disc1] = {MagicMock()}
-    connection_manager.active_connections[disc2] = {MagicMock()}
+    connection_manager.active_connections[disc1] = [MagicMock()]
+    connection_manager.active_connections[disc2] = [MagicMock()]
 
     active = connection_manager.get_active_discussions()
 
@@ -328,12 +455,10 @@ async def test_concurrent_broadcast(connection_manager):
     # Setup connections for each discussion
     for disc_id in discussions:
         ws = AsyncMock(spec=WebSocket)
-        ws.send_text = AsyncMock()
+        ws.send_bytes = AsyncMock()
         await connection_manager.connect(ws, disc_id)
 
     # Broadcast to all concurrently
-    import asyncio
-
     await asyncio.gather(*[
         connection_manager.broadcast(disc_id, {"type": "test", "data": f"msg_{disc_id}"})
         for disc_id in discussions
@@ -375,8 +500,6 @@ async def test_message_serialization(connection_manager, mock_websocket):
     """Test that complex messages are properly serialized"""
     discussion_id = "disc_test_serialization"
 
-    mock_websocket.send_text = AsyncMock()
-
     await connection_manager.connect(mock_websocket, discussion_id)
 
     complex_message = {
@@ -394,13 +517,15 @@ async def test_message_serialization(connection_manager, mock_websocket):
     }
 
     await connection_manager.broadcast(discussion_id, complex_message)
+    await connection_manager.flush(discussion_id)
 
     # Should serialize correctly
-    mock_websocket.send_text.assert_called_once()
-    sent_text = mock_websocket.send_text.call_args[0][0]
+    # Welcome message first, then the broadcast
+    assert mock_websocket.send_bytes.call_count == 2
+    sent_payload = mock_websocket.send_bytes.call_args[0][0]
 
     # Should be valid JSON
-    parsed = json.loads(sent_text)
+    parsed = json.loads(sent_payload)
     assert parsed == complex_message
 
 
@@ -435,12 +560,13 @@ async def test_heartbeat_ping(connection_manager, mock_websocket):
         mock_websocket,
         {"type": "ping"}
     )
+    await connection_manager.flush(discussion_id)
 
-    # send_personal_message uses send_json(), not send_text()
-    # Note: send_json is called twice - once by connect() for welcome message, once for ping
-    assert mock_websocket.send_json.call_count == 2
+    # send_personal_message sends binary JSON frames via send_bytes()
+    # Note: send_bytes is called twice - once by connect() for welcome message, once for ping
+    assert mock_websocket.send_bytes.call_count == 2
 
     # Check the second call (our ping message)
-    sent_data = mock_websocket.send_json.call_args_list[1][0][0]
+    sent_data = json.loads(mock_websocket.send_bytes.call_args_list[1][0][0])
     assert sent_data["type"] == "ping"
     assert "timestamp" in sent_data  # Timestamp is added automatically